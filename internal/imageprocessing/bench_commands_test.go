@@ -264,6 +264,59 @@ func BenchmarkScaleCommand_Execute_Large(b *testing.B) {
 	}
 }
 
+// makeLargeNRGBAPNG creates a synthetic PNG with varying alpha, which decodes to *image.NRGBA
+// like real PNGs with transparency.
+func makeLargeNRGBAPNG(b *testing.B, width, height int) []byte {
+	b.Helper()
+	img := image.NewNRGBA(image.Rect(0, 0, width, height))
+	for y := 0; y < height; y++ {
+		yy := uint8((y * 255) / height) // #nosec G115 -- computed gradient is in 0..255 for 0<=y<height
+		for x := 0; x < width; x++ {
+			xx := uint8((x * 255) / width) // #nosec G115 -- computed gradient is in 0..255 for 0<=x<width
+			img.SetNRGBA(x, y, color.NRGBA{R: xx, G: yy, B: (xx + yy) / 2, A: 128 + xx/2})
+		}
+	}
+	var buf bytes.Buffer
+	if err := png.Encode(&buf, img); err != nil {
+		b.Fatalf("failed to encode synthetic PNG: %v", err)
+	}
+	return buf.Bytes()
+}
+
+func BenchmarkScaleCommand_Execute_LargeNRGBA(b *testing.B) {
+	// 4000x3000 landscape synthetic image with transparency
+	imageData := makeLargeNRGBAPNG(b, 4000, 3000)
+
+	cases := []struct {
+		name   string
+		height int
+		width  int
+	}{
+		{"1920x1080", 1080, 1920},
+		{"800x600", 600, 800},
+	}
+
+	for _, tc := range cases {
+		b.Run(tc.name, func(b *testing.B) {
+			command, err := NewScaleCommand(map[string]any{
+				"height": tc.height,
+				"width":  tc.width,
+			})
+			if err != nil {
+				b.Fatalf("failed to create ScaleCommand: %v", err)
+			}
+
+			b.ReportAllocs()
+			b.ResetTimer()
+			for i := 0; i < b.N; i++ {
+				if _, err := command.Execute(imageData); err != nil {
+					b.Fatalf("execute failed: %v", err)
+				}
+			}
+		})
+	}
+}
+
 func BenchmarkPixelScaleCommand_Execute_Large(b *testing.B) {
 	imageData := makeLargePNG(b, 4000, 3000)
 
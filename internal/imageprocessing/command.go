@@ -1,11 +1,55 @@
 package imageprocessing
 
+import (
+	"fmt"
+	"image"
+	"log/slog"
+)
+
 // Command defines the interface for all image processing commands.
 type Command interface {
 	Name() string
 	Execute(imageData []byte) ([]byte, error)
 }
 
+// ImageCommand is implemented by commands that can also work on an already decoded image.
+// Pipelines use it to hand images directly from one command to the next and encode PNG only once.
+// ExecuteImage returns img itself when the command leaves the image unchanged.
+type ImageCommand interface {
+	Command
+	ExecuteImage(img image.Image) (image.Image, error)
+}
+
+// executeViaImage implements Execute for an ImageCommand: it decodes imageData, applies ExecuteImage
+// and encodes the result, returning imageData itself when the command leaves the image unchanged.
+func executeViaImage(command ImageCommand, imageData []byte) ([]byte, error) {
+	name := command.Name()
+
+	img, err := decodePNG(imageData)
+	if err != nil {
+		slog.Error(name+": failed to decode PNG image", "error", err)
+		return nil, fmt.Errorf("failed to decode PNG image: %w", err)
+	}
+
+	out, err := command.ExecuteImage(img)
+	if err != nil {
+		return nil, err
+	}
+	if out == img {
+		slog.Debug(name + ": image unchanged; returning original data")
+		return imageData, nil
+	}
+
+	result, err := encodePNG(out)
+	if err != nil {
+		slog.Error(name+": failed to encode PNG image", "error", err)
+		return nil, fmt.Errorf("failed to encode PNG image: %w", err)
+	}
+
+	slog.Debug(name+": complete", "output_size_bytes", len(result))
+	return result, nil
+}
+
 // CommandFactory is a function type that creates a command from configuration parameters.
 type CommandFactory func(params map[string]any) (Command, error)
 
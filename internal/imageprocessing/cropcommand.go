@@ -1,11 +1,9 @@
 package imageprocessing
 
 import (
-	"bytes"
 	"fmt"
 	"image"
 	"image/draw"
-	"image/png"
 	"log/slog"
 
 )
@@ -87,13 +85,11 @@ func (c *CropCommand) Execute(imageData []byte) ([]byte, error) {
 	slog.Debug("CropCommand: decoding image",
 		"input_size_bytes", len(imageData))
 
-	// Decode the PNG image
-	img, err := png.Decode(bytes.NewReader(imageData))
-	if err != nil {
-		slog.Error("CropCommand: failed to decode PNG image", "error", err)
-		return nil, fmt.Errorf("failed to decode PNG image: %w", err)
-	}
+	return executeViaImage(c, imageData)
+}
 
+// ExecuteImage center-crops a decoded image, returning img itself when no crop is needed
+func (c *CropCommand) ExecuteImage(img image.Image) (image.Image, error) {
 	// Get original dimensions
 	bounds := img.Bounds()
 	originalWidth := bounds.Dx()
@@ -112,7 +108,7 @@ func (c *CropCommand) Execute(imageData []byte) ([]byte, error) {
 	// If requested dimensions are larger than original, return original
 	if cropWidth >= originalWidth && cropHeight >= originalHeight {
 		slog.Debug("CropCommand: no crop needed, dimensions already smaller or equal")
-		return imageData, nil
+		return img, nil
 	}
 
 	// Limit crop dimensions to original size
@@ -140,26 +136,22 @@ func (c *CropCommand) Execute(imageData []byte) ([]byte, error) {
 		"crop_height", cropHeight)
 
 	// Create a new image with the cropped region
-	croppedImg := image.NewRGBA(image.Rect(0, 0, cropWidth, cropHeight))
-	// Use draw.Draw with a source offset for a faster crop than per-pixel loops
-	draw.Draw(croppedImg, croppedImg.Bounds(), img, image.Point{X: x0, Y: y0}, draw.Src)
-
-	slog.Debug("CropCommand: encoding cropped image")
-
-	// Encode the cropped image back to PNG bytes
-	var buf bytes.Buffer
-	bb := croppedImg.Bounds()
-	buf.Grow(bb.Dx() * bb.Dy())
-	err = png.Encode(&buf, croppedImg)
-	if err != nil {
-		slog.Error("CropCommand: failed to encode cropped image", "error", err)
-		return nil, fmt.Errorf("failed to encode cropped PNG image: %w", err)
+	var croppedImg image.Image
+	if p, ok := img.(*image.Paletted); ok {
+		// Keep paletted input (e.g. dithered output) paletted so it encodes as an indexed PNG
+		dst := image.NewPaletted(image.Rect(0, 0, cropWidth, cropHeight), p.Palette)
+		for y := 0; y < cropHeight; y++ {
+			srcOff := p.PixOffset(bounds.Min.X+x0, bounds.Min.Y+y0+y)
+			copy(dst.Pix[y*dst.Stride:y*dst.Stride+cropWidth], p.Pix[srcOff:srcOff+cropWidth])
+		}
+		croppedImg = dst
+	} else {
+		rgba := image.NewRGBA(image.Rect(0, 0, cropWidth, cropHeight))
+		// Use draw.Draw with a source offset for a faster crop than per-pixel loops
+		draw.Draw(rgba, rgba.Bounds(), img, bounds.Min.Add(image.Point{X: x0, Y: y0}), draw.Src)
+		croppedImg = rgba
 	}
-
-	slog.Debug("CropCommand: crop complete",
-		"output_size_bytes", buf.Len())
-
-	return buf.Bytes(), nil
+	return croppedImg, nil
 }
 
 // GetHeight returns the configured height
@@ -2,6 +2,8 @@ package imageprocessing
 
 import (
 	"bytes"
+	"image"
+	"image/color"
 	"image/png"
 	"os"
 	"testing"
@@ -220,3 +222,46 @@ func TestCropCommand_WithRealImage(t *testing.T) {
 		t.Errorf("Result is not valid PNG: %v", err)
 	}
 }
+
+func TestCropCommand_Execute_PalettedStaysPaletted(t *testing.T) {
+	palette := color.Palette{color.RGBA{0, 0, 0, 255}, color.RGBA{255, 255, 255, 255}}
+	src := image.NewPaletted(image.Rect(0, 0, 6, 6), palette)
+	for y := 0; y < 6; y++ {
+		for x := 0; x < 6; x++ {
+			src.SetColorIndex(x, y, uint8((x+y)%2)) //nolint:gosec // small test values
+		}
+	}
+	var buf bytes.Buffer
+	if err := png.Encode(&buf, src); err != nil {
+		t.Fatalf("failed to encode test image: %v", err)
+	}
+
+	cmd, err := NewCropCommand(map[string]any{"height": 2, "width": 3})
+	if err != nil {
+		t.Fatalf("failed to create command: %v", err)
+	}
+	out, err := cmd.Execute(buf.Bytes())
+	if err != nil {
+		t.Fatalf("Execute failed: %v", err)
+	}
+
+	img, err := png.Decode(bytes.NewReader(out))
+	if err != nil {
+		t.Fatalf("failed to decode output: %v", err)
+	}
+	got, ok := img.(*image.Paletted)
+	if !ok {
+		t.Fatalf("expected paletted output, got %T", img)
+	}
+	if got.Bounds() != image.Rect(0, 0, 3, 2) {
+		t.Fatalf("unexpected bounds: %v", got.Bounds())
+	}
+	x0, y0 := (6-3)/2, (6-2)/2
+	for y := 0; y < 2; y++ {
+		for x := 0; x < 3; x++ {
+			if got.ColorIndexAt(x, y) != src.ColorIndexAt(x+x0, y+y0) {
+				t.Errorf("pixel (%d,%d) mismatch", x, y)
+			}
+		}
+	}
+}
@@ -1,12 +1,13 @@
 package imageprocessing
 
 import (
-	"bytes"
 	"fmt"
 	"image"
 	"image/color"
-	"image/png"
 	"log/slog"
+	"math"
+	"slices"
+	"sync"
 
 )
 
@@ -33,6 +34,12 @@ type DitherParams struct {
 	PalettePairs []ColorPair
 	// Algorithm selects the dithering algorithm: "floyd-steinberg" (default) or "atkinson"
 	Algorithm string
+	// Serpentine alternates the scan direction per row (floyd-steinberg only), which avoids
+	// the directional artifacts of always diffusing error to the right
+	Serpentine bool
+	// ColorDistance selects the metric used to pick the nearest dither color:
+	// "rgb" (default, Euclidean in sRGB) or "lab" (Euclidean in CIE Lab, perceptually closer)
+	ColorDistance string
 }
 
 // Defaults to black/white with identical device and dithering colors
@@ -78,6 +85,29 @@ func NewDitherParamsFromMap(params map[string]any) (*DitherParams, error) {
 		ditherParams.Algorithm = "floyd-steinberg"
 	}
 
+	ditherParams.Serpentine = GetBoolParam(params, "serpentine", false)
+	if ditherParams.Serpentine && ditherParams.Algorithm != "floyd-steinberg" {
+		return nil, fmt.Errorf("serpentine is only supported with floyd-steinberg, got ditheringAlgorithm: %s", ditherParams.Algorithm)
+	}
+
+	// Parse optional colorDistance parameter
+	if distParam, ok := params["colorDistance"]; ok {
+		if s, ok := distParam.(string); ok {
+			switch s {
+			case "", "rgb":
+				ditherParams.ColorDistance = "rgb"
+			case "lab":
+				ditherParams.ColorDistance = "lab"
+			default:
+				return nil, fmt.Errorf("invalid colorDistance: %s", s)
+			}
+		} else {
+			return nil, fmt.Errorf("colorDistance must be a string")
+		}
+	} else {
+		ditherParams.ColorDistance = "rgb"
+	}
+
 	return ditherParams, nil
 }
 
@@ -229,8 +259,90 @@ func numberToByte(val any, colorIdx, compIdx int) (int, error) {
 
 // DitherCommand handles image dithering and maps to device colors
 type DitherCommand struct {
-	name   string
-	params *DitherParams
+	name     string
+	params   *DitherParams
+	palettes *ditherPalettes
+}
+
+// ditherPalettes holds the lookup tables derived from the configured palette pairs.
+// They are built once per command and reused by every Execute call.
+type ditherPalettes struct {
+	device     []color.RGBA
+	dither     []color.RGBA
+	deviceKeys paletteKeySet
+	// ditherChannels is the dither palette in per-channel layout for the nearest-color search
+	ditherChannels paletteChannels
+	// output is the device palette for paletted output images; each image gets its own copy
+	output color.Palette
+}
+
+// ditherPalettesCacheSize bounds how many distinct palette configurations are kept prepared
+const ditherPalettesCacheSize = 8
+
+// ditherPalettesCache memoizes prepared palettes by their contents. Commands are recreated for
+// every image a pipeline processes, so this keeps the lookup tables from being rebuilt each time.
+// Cached palettes are shared between commands and must not be modified.
+var ditherPalettesCache = struct {
+	sync.Mutex
+	entries map[string]*ditherPalettes
+	order   []string
+}{entries: make(map[string]*ditherPalettes)}
+
+// ditherPalettesKey identifies a palette configuration by its colors and color distance
+func ditherPalettesKey(pairs []ColorPair, colorDistance string) string {
+	key := make([]byte, 0, len(colorDistance)+1+8*len(pairs))
+	key = append(key, colorDistance...)
+	key = append(key, 0)
+	for _, p := range pairs {
+		key = append(key, p.Device.R, p.Device.G, p.Device.B, p.Device.A, p.Dither.R, p.Dither.G, p.Dither.B, p.Dither.A)
+	}
+	return string(key)
+}
+
+// cachedDitherPalettes returns prepared palettes for the pairs, building them on first use.
+// Invalid palettes are not cached.
+func cachedDitherPalettes(pairs []ColorPair, colorDistance string) (*ditherPalettes, error) {
+	key := ditherPalettesKey(pairs, colorDistance)
+
+	cache := &ditherPalettesCache
+	cache.Lock()
+	defer cache.Unlock()
+
+	if palettes, ok := cache.entries[key]; ok {
+		return palettes, nil
+	}
+	palettes, err := newDitherPalettes(pairs, colorDistance)
+	if err != nil {
+		return nil, err
+	}
+	// Evict the oldest entry once the cache is full
+	if len(cache.order) >= ditherPalettesCacheSize {
+		delete(cache.entries, cache.order[0])
+		cache.order = cache.order[1:]
+	}
+	cache.entries[key] = palettes
+	cache.order = append(cache.order, key)
+	return palettes, nil
+}
+
+// newDitherPalettes validates the palette pairs and derives the lookup tables used while dithering
+func newDitherPalettes(pairs []ColorPair, colorDistance string) (*ditherPalettes, error) {
+	devicePalette, ditherPalette := palettesFromPairs(pairs)
+	if len(devicePalette) == 0 || len(ditherPalette) == 0 || len(devicePalette) != len(ditherPalette) {
+		return nil, fmt.Errorf("invalid palettes: device %d, dither %d", len(devicePalette), len(ditherPalette))
+	}
+	// Enforce paletted image constraints: indices are uint8, so palettes must contain at most 256 colors
+	if len(devicePalette) > 256 || len(ditherPalette) > 256 {
+		return nil, fmt.Errorf("palette length exceeds 256 colors; got device=%d dither=%d", len(devicePalette), len(ditherPalette))
+	}
+
+	return &ditherPalettes{
+		device:         devicePalette,
+		dither:         ditherPalette,
+		deviceKeys:     buildPaletteSet(devicePalette),
+		ditherChannels: newPaletteChannels(ditherPalette, colorDistance == "lab"),
+		output:         toColorPalette(devicePalette),
+	}, nil
 }
 
 // NewDitherCommand creates a new dither command from configuration parameters
@@ -240,9 +352,15 @@ func NewDitherCommand(params map[string]any) (Command, error) {
 		return nil, err
 	}
 
+	palettes, err := cachedDitherPalettes(typedParams.PalettePairs, typedParams.ColorDistance)
+	if err != nil {
+		return nil, err
+	}
+
 	return &DitherCommand{
-		name:   "DitherCommand",
-		params: typedParams,
+		name:     "DitherCommand",
+		params:   typedParams,
+		palettes: palettes,
 	}, nil
 }
 
@@ -255,67 +373,77 @@ func (c *DitherCommand) Name() string {
 func (c *DitherCommand) Execute(imageData []byte) ([]byte, error) {
 	slog.Debug("DitherCommand: dither and map",
 		"input_size_bytes", len(imageData),
-		"ditheringAlgorithm", c.params.Algorithm)
+		"ditheringAlgorithm", c.params.Algorithm,
+		"colorDistance", c.params.ColorDistance)
 
-	// decode
-	img, err := decodePNGData(imageData)
-	if err != nil {
-		slog.Error("DitherCommand: failed to decode PNG image", "error", err)
-		return nil, fmt.Errorf("failed to decode PNG image: %w", err)
-	}
+	return executeViaImage(c, imageData)
+}
 
-	// extract palettes
-	devicePalette, ditherPalette := palettesFromPairs(c.params.PalettePairs)
-	if len(devicePalette) == 0 || len(ditherPalette) == 0 || len(devicePalette) != len(ditherPalette) {
-		return nil, fmt.Errorf("invalid palettes: device %d, dither %d", len(devicePalette), len(ditherPalette))
-	}
-	// Enforce paletted image constraints: indices are uint8, so palettes must contain at most 256 colors
-	if len(devicePalette) > 256 || len(ditherPalette) > 256 {
-		return nil, fmt.Errorf("palette length exceeds 256 colors; got device=%d dither=%d", len(devicePalette), len(ditherPalette))
-	}
-	if len(devicePalette) > 0 && len(ditherPalette) > 0 {
-		// Log palette sizes and the first pair to verify config ingestion at runtime
-		slog.Debug("DitherCommand: using configured palettes",
-			"device_count", len(devicePalette),
-			"dither_count", len(ditherPalette),
-			"first_device", devicePalette[0],
-			"first_dither", ditherPalette[0],
-		)
-	}
+// ExecuteImage dithers a decoded image, returning img itself when it already uses only device colors
+func (c *DitherCommand) ExecuteImage(img image.Image) (image.Image, error) {
+	// palettes were validated and prepared when the command was created
+	pal := c.palettes
+	// Log palette sizes and the first pair to verify config ingestion at runtime
+	slog.Debug("DitherCommand: using configured palettes",
+		"device_count", len(pal.device),
+		"dither_count", len(pal.dither),
+		"first_device", pal.device[0],
+		"first_dither", pal.dither[0],
+	)
 
 	// Optimization: if the image already contains only exact device colors (after alpha compositing over white),
-	// skip dithering and mapping entirely and return the original bytes.
-	if !needsDitheringAgainst(img, devicePalette) {
-		slog.Debug("DitherCommand: image already matches device palette; skipping dithering")
-		return imageData, nil
+	// skip dithering and mapping entirely and return the original image.
+	// Paletted images are checked by palette index and only expanded to RGBA when they need dithering;
+	// other images are converted once into a flat RGBA buffer shared by the check and the dithering pass.
+	var src *image.RGBA
+	if p, ok := img.(*image.Paletted); ok {
+		if !palettedNeedsDitheringAgainst(p, pal.deviceKeys) {
+			slog.Debug("DitherCommand: paletted image already uses only device colors; skipping dithering")
+			return img, nil
+		}
+		src = toRGBA(p)
+	} else {
+		src = toRGBA(img)
+		if !needsDitheringAgainst(src, pal.deviceKeys) {
+			slog.Debug("DitherCommand: image already matches device palette; skipping dithering")
+			return img, nil
+		}
 	}
 
 	// perform dithering with quantization against ditherPalette, write devicePalette colors
-	var outImg image.Image
+	var (
+		outImg image.Image
+		err    error
+	)
 	switch c.params.Algorithm {
 	case "atkinson":
-		outImg, err = ditherAndMapAtkinson(img, ditherPalette, devicePalette)
+		outImg, err = ditherAndMapAtkinson(src, pal.ditherChannels, pal.output)
 	default:
-		outImg, err = ditherAndMapFloydSteinberg(img, ditherPalette, devicePalette)
+		outImg, err = ditherAndMapFloydSteinberg(src, pal.ditherChannels, pal.output, c.params.Serpentine)
 	}
 	if err != nil {
 		return nil, err
 	}
+	return outImg, nil
+}
 
-	// encode
-	outBytes, err := encodePNGImage(outImg)
-	if err != nil {
-		slog.Error("DitherCommand: failed to encode mapped image", "error", err)
-		return nil, fmt.Errorf("failed to encode PNG image: %w", err)
+// paletteRGBALookup maps palette indices to premultiplied RGBA bytes; indices beyond the palette map to zero
+func paletteRGBALookup(palette color.Palette) *[256][4]uint8 {
+	var lut [256][4]uint8
+	for i, c := range palette {
+		if i >= len(lut) {
+			break
+		}
+		r16, g16, b16, a16 := c.RGBA()
+		lut[i] = [4]uint8{uint8(r16 >> 8), uint8(g16 >> 8), uint8(b16 >> 8), uint8(a16 >> 8)} // #nosec G115 -- 16-bit components shifted to 0..255
 	}
-
-	slog.Debug("DitherCommand: complete", "output_size_bytes", len(outBytes))
-	return outBytes, nil
+	return &lut
 }
 
-// decodePNGData decodes PNG bytes into an image.Image
-func decodePNGData(data []byte) (image.Image, error) {
-	return png.Decode(bytes.NewReader(data))
+// rgbaRow returns the first w pixels (4 bytes each) of row y, relative to the image origin
+func rgbaRow(img *image.RGBA, y, w int) []uint8 {
+	start := y * img.Stride
+	return img.Pix[start : start+4*w]
 }
 
 // palettesFromPairs extracts device and dither palettes from ColorPair slice
@@ -329,15 +457,77 @@ func palettesFromPairs(pairs []ColorPair) ([]color.RGBA, []color.RGBA) {
 	return device, dither
 }
 
+// packRGB packs an 8-bit RGB triple into a single 24-bit key
+func packRGB(r, g, b uint8) uint32 {
+	return uint32(r)<<16 | uint32(g)<<8 | uint32(b)
+}
+
+const (
+	// noPaletteKey marks empty perfect-hash slots; packed RGB keys only use the low 24 bits
+	noPaletteKey = uint32(1) << 24
+	// perfectHashAttempts bounds the multiplier search in buildPaletteSet
+	perfectHashAttempts = 64
+)
+
+// paletteKeySet answers "is this packed RGB key a palette color" for the per-pixel palette checks.
+// For typical small palettes it uses a multiplicative perfect hash: every key owns a distinct slot,
+// so a lookup is one multiply, one table load and one compare. Palettes for which no collision-free
+// multiplier is found fall back to a binary search over the sorted keys.
+type paletteKeySet struct {
+	// keys holds the sorted, de-duplicated palette keys
+	keys []uint32
+	// slots maps (key*multiplier)>>24 to the key owning that slot; nil when no perfect hash was found
+	slots      *[256]uint32
+	multiplier uint32
+}
+
 // buildPaletteSet constructs a fast lookup set for palette RGB triples
-func buildPaletteSet(palette []color.RGBA) map[[3]uint8]struct{} {
-	set := make(map[[3]uint8]struct{}, len(palette))
+func buildPaletteSet(palette []color.RGBA) paletteKeySet {
+	keys := make([]uint32, 0, len(palette))
 	for _, p := range palette {
-		set[[3]uint8{p.R, p.G, p.B}] = struct{}{}
+		keys = append(keys, packRGB(p.R, p.G, p.B))
+	}
+	slices.Sort(keys)
+	set := paletteKeySet{keys: slices.Compact(keys)}
+
+	// Deterministic sequence of odd multipliers (golden-ratio based)
+	multiplier := uint32(0x9E3779B1)
+	for attempt := 0; attempt < perfectHashAttempts; attempt++ {
+		if slots, ok := perfectHashSlots(set.keys, multiplier); ok {
+			set.slots = slots
+			set.multiplier = multiplier
+			break
+		}
+		multiplier += 0x6A09E666
 	}
 	return set
 }
 
+// perfectHashSlots places every key at slot (key*multiplier)>>24, failing on the first collision
+func perfectHashSlots(keys []uint32, multiplier uint32) (*[256]uint32, bool) {
+	var slots [256]uint32
+	for i := range slots {
+		slots[i] = noPaletteKey
+	}
+	for _, k := range keys {
+		slot := (k * multiplier) >> 24
+		if slots[slot] != noPaletteKey {
+			return nil, false
+		}
+		slots[slot] = k
+	}
+	return &slots, true
+}
+
+// contains reports whether key is one of the palette keys
+func (s paletteKeySet) contains(key uint32) bool {
+	if s.slots != nil {
+		return s.slots[(key*s.multiplier)>>24] == key
+	}
+	_, ok := slices.BinarySearch(s.keys, key)
+	return ok
+}
+
 // toColorPalette converts []color.RGBA to a color.Palette for paletted images
 func toColorPalette(src []color.RGBA) color.Palette {
 	pal := make(color.Palette, len(src))
@@ -349,29 +539,21 @@ func toColorPalette(src []color.RGBA) color.Palette {
 
 // needsDitheringAgainst checks if, after alpha compositing over white, all pixels already match
 // a given palette color exactly. If so, dithering can be skipped.
-func needsDitheringAgainst(img image.Image, palette []color.RGBA) bool {
-	bounds := img.Bounds()
+func needsDitheringAgainst(src *image.RGBA, paletteSet paletteKeySet) bool {
+	bounds := src.Bounds()
 	w := bounds.Dx()
 	h := bounds.Dy()
 
-	paletteSet := buildPaletteSet(palette)
-
 	// Parallel row scan with early exit as soon as a non-palette pixel is found
 	found := parallelForStop(h, func(y int) bool {
-		yy := bounds.Min.Y + y
+		row := rgbaRow(src, y, w)
 		for x := 0; x < w; x++ {
-			xx := bounds.Min.X + x
-
-			r16, g16, b16, a16 := img.At(xx, yy).RGBA()
-			r8 := int(uint8(r16 >> 8)) // #nosec G115 -- components are 16-bit; shifting >>8 ensures 0..255 before conversion
-			g8 := int(uint8(g16 >> 8)) // #nosec G115
-			b8 := int(uint8(b16 >> 8)) // #nosec G115
-			a8 := int(uint8(a16 >> 8)) // #nosec G115
+			p := row[4*x : 4*x+4 : 4*x+4]
 
 			// Composite over white background (same formula used in dithering path)
-			r0, g0, b0 := compositeOverWhite(r8, g8, b8, a8)
+			r0, g0, b0 := compositeOverWhite(int(p[0]), int(p[1]), int(p[2]), int(p[3]))
 
-			if _, ok := paletteSet[[3]uint8{toUint8(r0), toUint8(g0), toUint8(b0)}]; !ok {
+			if !paletteSet.contains(packRGB(toUint8(r0), toUint8(g0), toUint8(b0))) {
 				return true // needs dithering
 			}
 		}
@@ -380,6 +562,36 @@ func needsDitheringAgainst(img image.Image, palette []color.RGBA) bool {
 	return found
 }
 
+// palettedNeedsDitheringAgainst is needsDitheringAgainst for paletted images. Each palette entry is
+// checked once; pixel indices are only scanned when some entry is not a device color.
+func palettedNeedsDitheringAgainst(src *image.Paletted, paletteSet paletteKeySet) bool {
+	lut := paletteRGBALookup(src.Palette)
+	var isDevice [256]bool
+	allDevice := true
+	for i := range src.Palette {
+		if i >= len(isDevice) {
+			break
+		}
+		p := lut[i]
+		r0, g0, b0 := compositeOverWhite(int(p[0]), int(p[1]), int(p[2]), int(p[3]))
+		isDevice[i] = paletteSet.contains(packRGB(toUint8(r0), toUint8(g0), toUint8(b0)))
+		allDevice = allDevice && isDevice[i]
+	}
+	if allDevice {
+		return false
+	}
+
+	w := src.Rect.Dx()
+	return parallelForStop(src.Rect.Dy(), func(y int) bool {
+		for _, idx := range src.Pix[y*src.Stride : y*src.Stride+w] {
+			if !isDevice[idx] {
+				return true
+			}
+		}
+		return false
+	})
+}
+
 // clamp8Int ensures an int is within 0..255
 func clamp8Int(v int) int {
 	if v < 0 {
@@ -399,14 +611,83 @@ func compositeOverWhite(r8, g8, b8, a8 int) (int, int, int) {
 	return r0, g0, b0
 }
 
-// nearestPaletteIndex returns index of the nearest palette color by Euclidean distance in sRGB
-func nearestPaletteIndex(r, g, b int, palette []color.RGBA) int {
+// paletteChannels stores a palette as separate per-channel arrays (structure of arrays).
+// The nearest-color search then streams through three contiguous int32 slices instead of
+// loading and widening the fields of each color.RGBA entry.
+type paletteChannels struct {
+	r, g, b []int32
+	// labL, labA, labB hold the palette in CIE Lab when matching by Lab distance; nil otherwise.
+	// The palette is converted once so only the pixel side needs converting per lookup.
+	labL, labA, labB []float64
+}
+
+// newPaletteChannels splits palette into per-channel arrays, adding its Lab form when useLab is set
+func newPaletteChannels(palette []color.RGBA, useLab bool) paletteChannels {
+	pc := paletteChannels{
+		r: make([]int32, len(palette)),
+		g: make([]int32, len(palette)),
+		b: make([]int32, len(palette)),
+	}
+	for i, c := range palette {
+		pc.r[i] = int32(c.R)
+		pc.g[i] = int32(c.G)
+		pc.b[i] = int32(c.B)
+	}
+	if useLab {
+		pc.labL = make([]float64, len(palette))
+		pc.labA = make([]float64, len(palette))
+		pc.labB = make([]float64, len(palette))
+		for i, c := range palette {
+			pc.labL[i], pc.labA[i], pc.labB[i] = srgbToLab(int(c.R), int(c.G), int(c.B))
+		}
+	}
+	return pc
+}
+
+// nearest returns index of the nearest palette color, by Euclidean distance in CIE Lab when the
+// palette carries Lab values and in sRGB otherwise. Ties resolve to the lowest index.
+func (pc paletteChannels) nearest(r, g, b int) int {
+	if pc.labL != nil {
+		return pc.nearestLab(r, g, b)
+	}
+	return pc.nearestRGB(r, g, b)
+}
+
+// nearestLab returns index of the nearest palette color by Euclidean distance (CIE76) in CIE Lab
+func (pc paletteChannels) nearestLab(r, g, b int) int {
+	pl := pc.labL
+	pa := pc.labA[:len(pl)]
+	pb := pc.labB[:len(pl)]
+	l, a, bb := srgbToLab(r, g, b)
+
 	bestIdx := 0
-	bestDist := int(^uint(0) >> 1)
-	for i := 0; i < len(palette); i++ {
-		dr := r - int(palette[i].R)
-		dg := g - int(palette[i].G)
-		db := b - int(palette[i].B)
+	bestDist := math.Inf(1)
+	for i := range pl {
+		dl := l - pl[i]
+		da := a - pa[i]
+		db := bb - pb[i]
+		dist := dl*dl + da*da + db*db
+		if dist < bestDist {
+			bestDist = dist
+			bestIdx = i
+		}
+	}
+	return bestIdx
+}
+
+// nearestRGB returns index of the nearest palette color by Euclidean distance in sRGB
+func (pc paletteChannels) nearestRGB(r, g, b int) int {
+	pr := pc.r
+	pg := pc.g[:len(pr)]
+	pb := pc.b[:len(pr)]
+	r32, g32, b32 := int32(r), int32(g), int32(b) // #nosec G115 -- inputs are clamped to 0..255
+
+	bestIdx := 0
+	bestDist := int32(math.MaxInt32)
+	for i := range pr {
+		dr := r32 - pr[i]
+		dg := g32 - pg[i]
+		db := b32 - pb[i]
 		dist := dr*dr + dg*dg + db*db
 		if dist < bestDist {
 			bestDist = dist
@@ -424,94 +705,85 @@ func roundDiv16FloydSteinberg(e int) int {
 	return (e - floydSteinbergScale/2) / floydSteinbergScale
 }
 
-// distributeFloydSteinbergError applies Floyd–Steinberg error distribution from pixel (x,y)
-func distributeFloydSteinbergError(x, y, w, h int, er, eg, eb int,
-	errCurrR, errCurrG, errCurrB, errNextR, errNextG, errNextB []int) {
-	if x+1 < w {
-		errCurrR[x+1] += er * wRight
-		errCurrG[x+1] += eg * wRight
-		errCurrB[x+1] += eb * wRight
-	}
-	if y+1 < h {
-		if x-1 >= 0 {
-			errNextR[x-1] += er * wDownLeft
-			errNextG[x-1] += eg * wDownLeft
-			errNextB[x-1] += eb * wDownLeft
-		}
-		errNextR[x] += er * wDown
-		errNextG[x] += eg * wDown
-		errNextB[x] += eb * wDown
-		if x+1 < w {
-			errNextR[x+1] += er * wDownRight
-			errNextG[x+1] += eg * wDownRight
-			errNextB[x+1] += eb * wDownRight
-		}
-	}
+// distributeFloydSteinbergError applies Floyd–Steinberg error distribution from the pixel at padded offset i.
+// Error rows hold interleaved RGB triples with one padding pixel on each side, so neighbors outside
+// the image land in the padding instead of needing bounds checks. Errors pushed into the next row
+// while processing the last row are never read.
+// dir is the offset of the next pixel in scan direction: 3 when scanning left-to-right, -3 right-to-left.
+func distributeFloydSteinbergError(i, dir int, er, eg, eb int, errCurr, errNext []int) {
+	ahead := i + dir
+	behind := i - dir
+
+	errCurr[ahead] += er * wRight
+	errCurr[ahead+1] += eg * wRight
+	errCurr[ahead+2] += eb * wRight
+
+	errNext[behind] += er * wDownLeft
+	errNext[behind+1] += eg * wDownLeft
+	errNext[behind+2] += eb * wDownLeft
+	errNext[i] += er * wDown
+	errNext[i+1] += eg * wDown
+	errNext[i+2] += eb * wDown
+	errNext[ahead] += er * wDownRight
+	errNext[ahead+1] += eg * wDownRight
+	errNext[ahead+2] += eb * wDownRight
 }
 
-// ditherAndMapFloydSteinberg applies integer-based Floyd–Steinberg error diffusion (non-serpentine)
+// ditherAndMapFloydSteinberg applies integer-based Floyd–Steinberg error diffusion
 // with nearest-color mapping in 8-bit sRGB and alpha compositing over white.
+// When serpentine is set, odd rows are scanned right-to-left with the diffusion kernel mirrored.
 // Quantization (error target) uses ditherPalette; output pixel is written using devicePalette at the chosen index.
-func ditherAndMapFloydSteinberg(img image.Image, ditherPalette, devicePalette []color.RGBA) (image.Image, error) {
-	bounds := img.Bounds()
+func ditherAndMapFloydSteinberg(src *image.RGBA, ditherPalette paletteChannels, devicePalette color.Palette, serpentine bool) (image.Image, error) {
+	bounds := src.Bounds()
 	w := bounds.Dx()
 	h := bounds.Dy()
 
-	// Output image as paletted with device palette for faster encoding and reduced memory
-	out := image.NewPaletted(bounds, toColorPalette(devicePalette))
+	// Output image as paletted with device palette for faster encoding and reduced memory.
+	// The palette is copied because devicePalette is shared through the palette cache.
+	out := image.NewPaletted(bounds, slices.Clone(devicePalette))
 
-	errCurrR := make([]int, w)
-	errCurrG := make([]int, w)
-	errCurrB := make([]int, w)
-	errNextR := make([]int, w)
-	errNextG := make([]int, w)
-	errNextB := make([]int, w)
+	// Error rows: interleaved RGB with one padding pixel on each side (see distributeFloydSteinbergError)
+	errCurr := make([]int, 3*(w+2))
+	errNext := make([]int, 3*(w+2))
 
-	// Iterate rows top-to-bottom, left-to-right (no serpentine)
+	// Iterate rows top-to-bottom; left-to-right unless serpentine reverses odd rows
 	for y := 0; y < h; y++ {
-		for x := 0; x < w; x++ {
-			xx := bounds.Min.X + x
-			yy := bounds.Min.Y + y
-
-			r16, g16, b16, a16 := img.At(xx, yy).RGBA()
-			r8 := int(uint8(r16 >> 8)) // #nosec G115 -- components are 16-bit; shifting >>8 ensures 0..255 before conversion
-			g8 := int(uint8(g16 >> 8)) // #nosec G115
-			b8 := int(uint8(b16 >> 8)) // #nosec G115
-			a8 := int(uint8(a16 >> 8)) // #nosec G115
+		row := rgbaRow(src, y, w)
+		outRow := out.Pix[y*out.Stride : y*out.Stride+w]
+		x, xEnd, step := 0, w, 1
+		if serpentine && y%2 == 1 {
+			x, xEnd, step = w-1, -1, -1
+		}
+		for ; x != xEnd; x += step {
+			p := row[4*x : 4*x+4 : 4*x+4]
+			i := 3 * (x + 1)
 
 			// Composite over white background (unpremultiplied) with rounding
-			r0, g0, b0 := compositeOverWhite(r8, g8, b8, a8)
+			r0, g0, b0 := compositeOverWhite(int(p[0]), int(p[1]), int(p[2]), int(p[3]))
 
 			// Apply accumulated error (scaled by 16) with rounding to nearest
-			rAdj := clamp8Int(r0 + roundDiv16FloydSteinberg(errCurrR[x]))
-			gAdj := clamp8Int(g0 + roundDiv16FloydSteinberg(errCurrG[x]))
-			bAdj := clamp8Int(b0 + roundDiv16FloydSteinberg(errCurrB[x]))
+			rAdj := clamp8Int(r0 + roundDiv16FloydSteinberg(errCurr[i]))
+			gAdj := clamp8Int(g0 + roundDiv16FloydSteinberg(errCurr[i+1]))
+			bAdj := clamp8Int(b0 + roundDiv16FloydSteinberg(errCurr[i+2]))
 
 			// Nearest palette index against dithering palette (Euclidean in sRGB)
-			bestIdx := nearestPaletteIndex(rAdj, gAdj, bAdj, ditherPalette)
-			quant := ditherPalette[bestIdx]
+			bestIdx := ditherPalette.nearest(rAdj, gAdj, bAdj)
 
 			// Error (unscaled) between adjusted source and quantized dither color
-			er := rAdj - int(quant.R)
-			eg := gAdj - int(quant.G)
-			eb := bAdj - int(quant.B)
+			er := rAdj - int(ditherPalette.r[bestIdx])
+			eg := gAdj - int(ditherPalette.g[bestIdx])
+			eb := bAdj - int(ditherPalette.b[bestIdx])
 
 			// Set output pixel to the corresponding device color index (paletted image)
-			out.SetColorIndex(xx, yy, uint8(bestIdx)) //nolint:gosec // bestIdx < 256 ensured by palette length validation
+			outRow[x] = uint8(bestIdx) //nolint:gosec // bestIdx < 256 ensured by palette length validation
 
-			// Distribute Floyd-Steinberg error to neighbors (L->R)
-			distributeFloydSteinbergError(x, y, w, h, er, eg, eb, errCurrR, errCurrG, errCurrB, errNextR, errNextG, errNextB)
+			// Distribute Floyd-Steinberg error to neighbors in scan direction
+			distributeFloydSteinbergError(i, 3*step, er, eg, eb, errCurr, errNext)
 		}
 
-		// Move next-row errors to current and clear next
-		errCurrR, errNextR = errNextR, errCurrR
-		errCurrG, errNextG = errNextG, errCurrG
-		errCurrB, errNextB = errNextB, errCurrB
-		for i := 0; i < w; i++ {
-			errNextR[i] = 0
-			errNextG[i] = 0
-			errNextB[i] = 0
-		}
+		// Move next-row errors to current and clear next (including padding)
+		errCurr, errNext = errNext, errCurr
+		clear(errNext)
 	}
 
 	return out, nil
@@ -572,13 +844,14 @@ func distributeAtkinsonError(
 // ditherAndMapAtkinson applies Standard Atkinson error diffusion (non-serpentine)
 // with nearest-color mapping in 8-bit sRGB and alpha compositing over white.
 // Quantization (error target) uses ditherPalette; output pixel is written using devicePalette at the chosen index.
-func ditherAndMapAtkinson(img image.Image, ditherPalette, devicePalette []color.RGBA) (image.Image, error) {
-	bounds := img.Bounds()
+func ditherAndMapAtkinson(src *image.RGBA, ditherPalette paletteChannels, devicePalette color.Palette) (image.Image, error) {
+	bounds := src.Bounds()
 	w := bounds.Dx()
 	h := bounds.Dy()
 
-	// Output image as paletted with device palette for faster encoding and reduced memory
-	out := image.NewPaletted(bounds, toColorPalette(devicePalette))
+	// Output image as paletted with device palette for faster encoding and reduced memory.
+	// The palette is copied because devicePalette is shared through the palette cache.
+	out := image.NewPaletted(bounds, slices.Clone(devicePalette))
 
 	errCurrR := make([]int, w)
 	errCurrG := make([]int, w)
@@ -592,18 +865,13 @@ func ditherAndMapAtkinson(img image.Image, ditherPalette, devicePalette []color.
 
 	// Iterate rows top-to-bottom, left-to-right (no serpentine)
 	for y := 0; y < h; y++ {
+		row := rgbaRow(src, y, w)
+		outRow := out.Pix[y*out.Stride : y*out.Stride+w]
 		for x := 0; x < w; x++ {
-			xx := bounds.Min.X + x
-			yy := bounds.Min.Y + y
-
-			r16, g16, b16, a16 := img.At(xx, yy).RGBA()
-			r8 := int(uint8(r16 >> 8)) // #nosec G115 -- components are 16-bit; shifting >>8 ensures 0..255 before conversion
-			g8 := int(uint8(g16 >> 8)) // #nosec G115
-			b8 := int(uint8(b16 >> 8)) // #nosec G115
-			a8 := int(uint8(a16 >> 8)) // #nosec G115
+			p := row[4*x : 4*x+4 : 4*x+4]
 
 			// Composite over white background (unpremultiplied) with rounding
-			r0, g0, b0 := compositeOverWhite(r8, g8, b8, a8)
+			r0, g0, b0 := compositeOverWhite(int(p[0]), int(p[1]), int(p[2]), int(p[3]))
 
 			// Apply accumulated error (scaled by 8) with rounding to nearest
 			rAdj := clamp8Int(r0 + roundDiv8Atkinson(errCurrR[x]))
@@ -611,16 +879,15 @@ func ditherAndMapAtkinson(img image.Image, ditherPalette, devicePalette []color.
 			bAdj := clamp8Int(b0 + roundDiv8Atkinson(errCurrB[x]))
 
 			// Nearest palette index against dithering palette (Euclidean in sRGB)
-			bestIdx := nearestPaletteIndex(rAdj, gAdj, bAdj, ditherPalette)
-			quant := ditherPalette[bestIdx]
+			bestIdx := ditherPalette.nearest(rAdj, gAdj, bAdj)
 
 			// Error (unscaled) between adjusted source and quantized dither color
-			er := rAdj - int(quant.R)
-			eg := gAdj - int(quant.G)
-			eb := bAdj - int(quant.B)
+			er := rAdj - int(ditherPalette.r[bestIdx])
+			eg := gAdj - int(ditherPalette.g[bestIdx])
+			eb := bAdj - int(ditherPalette.b[bestIdx])
 
 			// Set output pixel to the corresponding device color index (paletted image)
-			out.SetColorIndex(xx, yy, uint8(bestIdx)) //nolint:gosec // bestIdx < 256 ensured by palette length validation
+			outRow[x] = uint8(bestIdx) //nolint:gosec // bestIdx < 256 ensured by palette length validation
 
 			// Distribute Atkinson error to neighbors (each neighbor receives 1/8; arrays hold error scaled by 8)
 			distributeAtkinsonError(x, y, w, h, er, eg, eb, errCurrR, errCurrG, errCurrB, errNextR, errNextG, errNextB, errNext2R, errNext2G, errNext2B)
@@ -640,15 +907,6 @@ func ditherAndMapAtkinson(img image.Image, ditherPalette, devicePalette []color.
 	return out, nil
 }
 
-// encodePNGImage encodes an image.Image to PNG bytes
-func encodePNGImage(img image.Image) ([]byte, error) {
-	var buf bytes.Buffer
-	if err := png.Encode(&buf, img); err != nil {
-		return nil, err
-	}
-	return buf.Bytes(), nil
-}
-
 // GetParams returns the typed parameters
 func (c *DitherCommand) GetParams() *DitherParams {
 	return c.params
@@ -7,6 +7,7 @@ import (
 	"image/color"
 	"image/png"
 	"os"
+	"slices"
 	"testing"
 )
 
@@ -367,3 +368,309 @@ func TestNewDitherCommand_InvalidDitheringAlgorithm(t *testing.T) {
 		t.Error("Expected error for invalid ditheringAlgorithm")
 	}
 }
+
+// toRGBA must yield the same 8-bit components the dithering loops previously read via At().RGBA()
+func TestToRGBA_MatchesAtRGBA(t *testing.T) {
+	nrgba := image.NewNRGBA(image.Rect(3, 5, 40, 30))
+	for y := nrgba.Rect.Min.Y; y < nrgba.Rect.Max.Y; y++ {
+		for x := nrgba.Rect.Min.X; x < nrgba.Rect.Max.X; x++ {
+			nrgba.SetNRGBA(x, y, color.NRGBA{uint8(x * 7), uint8(y * 5), uint8(x + y), uint8(x * y)}) //nolint:gosec // test pattern wraps intentionally
+		}
+	}
+
+	palette := color.Palette{
+		color.RGBA{R: 0, G: 0, B: 0, A: 255},
+		color.NRGBA{R: 200, G: 100, B: 50, A: 128},
+		color.RGBA{R: 255, G: 255, B: 255, A: 255},
+	}
+	paletted := image.NewPaletted(image.Rect(2, 1, 19, 12), palette)
+	for i := range paletted.Pix {
+		paletted.Pix[i] = uint8(i % len(palette)) //nolint:gosec // index < len(palette)
+	}
+
+	for name, src := range map[string]image.Image{"nrgba": nrgba, "paletted": paletted} {
+		dst := toRGBA(src)
+		bounds := src.Bounds()
+		if dst.Bounds() != bounds {
+			t.Fatalf("%s: expected bounds %v, got %v", name, bounds, dst.Bounds())
+		}
+
+		w := bounds.Dx()
+		for y := 0; y < bounds.Dy(); y++ {
+			row := rgbaRow(dst, y, w)
+			for x := 0; x < w; x++ {
+				r16, g16, b16, a16 := src.At(bounds.Min.X+x, bounds.Min.Y+y).RGBA()
+				want := [4]uint8{uint8(r16 >> 8), uint8(g16 >> 8), uint8(b16 >> 8), uint8(a16 >> 8)} //nolint:gosec // 16-bit components shifted to 0..255
+				got := [4]uint8{row[4*x], row[4*x+1], row[4*x+2], row[4*x+3]}
+				if got != want {
+					t.Fatalf("%s: pixel (%d,%d): expected %v, got %v", name, x, y, want, got)
+				}
+			}
+		}
+	}
+}
+
+func TestPaletteKeySet_Contains(t *testing.T) {
+	set := buildPaletteSet([]color.RGBA{
+		{R: 255, G: 255, B: 255, A: 255},
+		{R: 0, G: 0, B: 0, A: 255},
+		{R: 178, G: 19, B: 24, A: 255},
+		{R: 0, G: 0, B: 0, A: 255}, // duplicate entries are tolerated
+	})
+
+	if set.slots == nil {
+		t.Error("Expected a perfect hash for a small palette")
+	}
+
+	// Exercise both the perfect hash and the binary search fallback
+	fallback := set
+	fallback.slots = nil
+	for _, s := range []paletteKeySet{set, fallback} {
+		for _, c := range [][3]uint8{{0, 0, 0}, {255, 255, 255}, {178, 19, 24}} {
+			if !s.contains(packRGB(c[0], c[1], c[2])) {
+				t.Errorf("Expected palette set to contain %v", c)
+			}
+		}
+		for _, c := range [][3]uint8{{0, 0, 1}, {178, 24, 19}, {254, 255, 255}} {
+			if s.contains(packRGB(c[0], c[1], c[2])) {
+				t.Errorf("Expected palette set not to contain %v", c)
+			}
+		}
+	}
+}
+
+// Every key of a full 256-color palette must be found regardless of which lookup strategy is chosen
+func TestPaletteKeySet_LargePalette(t *testing.T) {
+	palette := make([]color.RGBA, 256)
+	for i := range palette {
+		palette[i] = color.RGBA{R: uint8(i), G: uint8(255 - i), B: uint8(i * 7), A: 255} //nolint:gosec // test pattern wraps intentionally
+	}
+	set := buildPaletteSet(palette)
+	for _, c := range palette {
+		if !set.contains(packRGB(c.R, c.G, c.B)) {
+			t.Fatalf("Expected palette set to contain %v", c)
+		}
+	}
+	if set.contains(packRGB(1, 1, 1)) {
+		t.Error("Expected palette set not to contain (1,1,1)")
+	}
+}
+
+func TestNewDitherCommand_PaletteTooLarge(t *testing.T) {
+	palette := make([]any, 0, 257)
+	for i := 0; i < 257; i++ {
+		c := []any{i % 256, i / 256, 0}
+		palette = append(palette, []any{c, c})
+	}
+
+	_, err := NewDitherCommand(map[string]any{"palette": palette})
+	if err == nil {
+		t.Error("Expected error for palette with more than 256 colors")
+	}
+}
+
+func TestToRGBA_RGBAInputIsNotCopied(t *testing.T) {
+	src := image.NewRGBA(image.Rect(0, 0, 8, 8))
+	if dst := toRGBA(src); dst != src {
+		t.Error("Expected *image.RGBA input to be returned without conversion")
+	}
+}
+
+func TestDitherCommand_Serpentine(t *testing.T) {
+	imageData, err := os.ReadFile("testdata/peppers.png")
+	if err != nil {
+		t.Fatalf("Failed to load test image: %v", err)
+	}
+	img, err := png.Decode(bytes.NewReader(imageData))
+	if err != nil {
+		t.Fatalf("Failed to decode test image: %v", err)
+	}
+
+	cmd, err := NewDitherCommand(map[string]any{"serpentine": true})
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+	if !cmd.(*DitherCommand).GetParams().Serpentine {
+		t.Fatal("Expected serpentine parameter to be set")
+	}
+
+	pal := cmd.(*DitherCommand).palettes
+	src := toRGBA(img)
+	plainImg, _ := ditherAndMapFloydSteinberg(src, pal.ditherChannels, pal.output, false)
+	serpImg, _ := ditherAndMapFloydSteinberg(src, pal.ditherChannels, pal.output, true)
+	plain := plainImg.(*image.Paletted)
+	serp := serpImg.(*image.Paletted)
+
+	// The first row is scanned left-to-right in both modes and must match; later rows diverge
+	w := plain.Bounds().Dx()
+	if !bytes.Equal(plain.Pix[:w], serp.Pix[:w]) {
+		t.Error("Expected first row to be identical for serpentine and plain scans")
+	}
+	if bytes.Equal(plain.Pix, serp.Pix) {
+		t.Error("Expected serpentine scan to change the dithered output")
+	}
+}
+
+func TestDitherCommand_Execute_LabColorDistance(t *testing.T) {
+	imageData := createTestImage(64, 64)
+
+	cmd, err := NewDitherCommand(map[string]any{
+		"colorDistance": "lab",
+		"palette": []any{
+			[]any{[]any{0, 0, 0}, []any{25, 30, 33}},
+			[]any{[]any{255, 255, 255}, []any{232, 232, 232}},
+			[]any{[]any{255, 0, 0}, []any{178, 19, 24}},
+		},
+	})
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+	if got := cmd.(*DitherCommand).GetParams().ColorDistance; got != "lab" {
+		t.Errorf("Expected colorDistance lab, got %s", got)
+	}
+
+	result, err := cmd.Execute(imageData)
+	if err != nil {
+		t.Fatalf("Execute failed: %v", err)
+	}
+	if _, err := png.Decode(bytes.NewReader(result)); err != nil {
+		t.Errorf("Result is not valid PNG: %v", err)
+	}
+}
+
+func TestPaletteChannels_NearestLabDiffersFromRGB(t *testing.T) {
+	palette := []color.RGBA{{0, 0, 0, 255}, {255, 255, 255, 255}, {0, 0, 255, 255}}
+	// Dark navy is closer to black in sRGB distance but perceptually closer to blue
+	r, g, b := 0, 0, 120
+
+	if got := newPaletteChannels(palette, false).nearest(r, g, b); got != 0 {
+		t.Errorf("Expected rgb distance to pick black (0), got %d", got)
+	}
+	if got := newPaletteChannels(palette, true).nearest(r, g, b); got != 2 {
+		t.Errorf("Expected lab distance to pick blue (2), got %d", got)
+	}
+}
+
+func TestNewDitherCommand_SerpentineRequiresFloydSteinberg(t *testing.T) {
+	_, err := NewDitherCommand(map[string]any{
+		"ditheringAlgorithm": "atkinson",
+		"serpentine":         true,
+	})
+	if err == nil {
+		t.Error("Expected error for serpentine with atkinson")
+	}
+}
+
+func TestNewDitherCommand_InvalidColorDistance(t *testing.T) {
+	_, err := NewDitherCommand(map[string]any{
+		"colorDistance": "ciede2000",
+	})
+	if err == nil {
+		t.Error("Expected error for invalid colorDistance")
+	}
+}
+
+func TestNewDitherCommand_SharesPreparedPalettes(t *testing.T) {
+	params := map[string]any{
+		"palette": []any{
+			[]any{[]any{0, 0, 0}, []any{25, 30, 33}},
+			[]any{[]any{255, 255, 255}, []any{232, 232, 232}},
+		},
+	}
+	first, err := NewDitherCommand(params)
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+	second, err := NewDitherCommand(params)
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+	if first.(*DitherCommand).palettes != second.(*DitherCommand).palettes {
+		t.Error("Expected commands with equal palettes to share prepared palettes")
+	}
+
+	params["colorDistance"] = "lab"
+	lab, err := NewDitherCommand(params)
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+	if lab.(*DitherCommand).palettes == first.(*DitherCommand).palettes {
+		t.Error("Expected a different color distance to use separately prepared palettes")
+	}
+}
+
+func TestDitherCommand_Execute_PalettedDevicePaletteSkipsDithering(t *testing.T) {
+	cmd, err := NewDitherCommand(map[string]any{})
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+
+	encode := func(img image.Image) []byte {
+		var buf bytes.Buffer
+		if err := png.Encode(&buf, img); err != nil {
+			t.Fatalf("Failed to encode test image: %v", err)
+		}
+		return buf.Bytes()
+	}
+	newPaletted := func(palette color.Palette, indices ...uint8) *image.Paletted {
+		img := image.NewPaletted(image.Rect(0, 0, 8, 8), palette)
+		for i := range img.Pix {
+			img.Pix[i] = indices[i%len(indices)]
+		}
+		return img
+	}
+	black, white, red := color.RGBA{0, 0, 0, 255}, color.RGBA{255, 255, 255, 255}, color.RGBA{255, 0, 0, 255}
+
+	tests := []struct {
+		name      string
+		img       *image.Paletted
+		unchanged bool
+	}{
+		{"device palette", newPaletted(color.Palette{black, white}, 0, 1), true},
+		{"unused non-device entry", newPaletted(color.Palette{black, white, red}, 0, 1), true},
+		{"used non-device entry", newPaletted(color.Palette{black, white, red}, 0, 1, 2), false},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			input := encode(tt.img)
+			result, err := cmd.Execute(input)
+			if err != nil {
+				t.Fatalf("Execute failed: %v", err)
+			}
+			if got := bytes.Equal(result, input); got != tt.unchanged {
+				t.Errorf("Expected unchanged=%v, got %v", tt.unchanged, got)
+			}
+		})
+	}
+}
+
+func TestDitherCommand_ExecuteImage_OutputPaletteIsNotShared(t *testing.T) {
+	cmd, err := NewDitherCommand(map[string]any{})
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+	img, err := png.Decode(bytes.NewReader(createTestImage(16, 16)))
+	if err != nil {
+		t.Fatalf("Failed to decode test image: %v", err)
+	}
+
+	first, err := cmd.(*DitherCommand).ExecuteImage(img)
+	if err != nil {
+		t.Fatalf("ExecuteImage failed: %v", err)
+	}
+	paletted, ok := first.(*image.Paletted)
+	if !ok {
+		t.Fatalf("Expected paletted output, got %T", first)
+	}
+	want := slices.Clone(paletted.Palette)
+	// Editing one output palette must not affect later results
+	paletted.Palette[0] = color.RGBA{1, 2, 3, 255}
+
+	second, err := cmd.(*DitherCommand).ExecuteImage(img)
+	if err != nil {
+		t.Fatalf("ExecuteImage failed: %v", err)
+	}
+	if got := second.(*image.Paletted).Palette; !slices.Equal(got, want) {
+		t.Errorf("Expected palette %v, got %v", want, got)
+	}
+}
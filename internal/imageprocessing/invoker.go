@@ -2,10 +2,147 @@ package imageprocessing
 
 import (
 	"fmt"
+	"image"
+	"image/color"
 	"log/slog"
+	"slices"
 	"time"
 )
 
+// pipelineImage carries the current image between pipeline commands.
+// It holds PNG bytes, a decoded image, or both when they are known to match, so consecutive
+// ImageCommands exchange decoded images and PNG is only decoded and encoded where needed.
+type pipelineImage struct {
+	data []byte
+	img  image.Image
+}
+
+// apply runs command on the current image, using ExecuteImage when the command supports it
+func (p *pipelineImage) apply(command Command) error {
+	if imageCommand, ok := command.(ImageCommand); ok {
+		if p.img == nil {
+			img, err := decodePNG(p.data)
+			if err != nil {
+				return fmt.Errorf("failed to decode PNG image: %w", err)
+			}
+			p.img = img
+		}
+		out, err := imageCommand.ExecuteImage(p.img)
+		if err != nil {
+			return err
+		}
+		// An unchanged image still matches the bytes it was decoded from
+		if out != p.img {
+			p.img = asDecodedPNG(out)
+			p.data = nil
+		}
+		return nil
+	}
+
+	data, err := p.bytes()
+	if err != nil {
+		return err
+	}
+	out, err := command.Execute(data)
+	if err != nil {
+		return err
+	}
+	p.data = out
+	p.img = nil
+	return nil
+}
+
+// decodedOnly reports whether the current image is only held decoded, without matching PNG bytes
+func (p *pipelineImage) decodedOnly() bool {
+	return p.data == nil && p.img != nil
+}
+
+// bytes returns the current image as PNG bytes, encoding it if it is only held decoded
+func (p *pipelineImage) bytes() ([]byte, error) {
+	if p.decodedOnly() {
+		data, err := encodePNG(p.img)
+		if err != nil {
+			return nil, fmt.Errorf("failed to encode PNG image: %w", err)
+		}
+		p.data = data
+	}
+	return p.data, nil
+}
+
+// sizeAttr describes the current image for logging: its PNG size when bytes are held,
+// otherwise the dimensions of the decoded image
+func (p *pipelineImage) sizeAttr(prefix string) slog.Attr {
+	if p.decodedOnly() {
+		b := p.img.Bounds()
+		return slog.String(prefix+"_dimensions", fmt.Sprintf("%dx%d", b.Dx(), b.Dy()))
+	}
+	return slog.Int(prefix+"_size_bytes", len(p.data))
+}
+
+// asDecodedPNG returns img with the pixel values it would have after a PNG encode/decode round trip.
+// PNG stores translucent colors unpremultiplied, so writing premultiplied RGBA pixels or palette entries
+// rounds them. Commands run one by one through Execute always see those rounded values, and the
+// in-memory handoff applies the same rounding so both give identical results. Other images produced
+// by commands round-trip unchanged and are returned as-is.
+func asDecodedPNG(img image.Image) image.Image {
+	switch m := img.(type) {
+	case *image.RGBA:
+		if m.Opaque() {
+			return m
+		}
+		return unpremultiplyRGBA(m)
+	case *image.Paletted:
+		var palette color.Palette
+		for i, c := range m.Palette {
+			if _, _, _, a := c.RGBA(); a == 0xffff {
+				continue
+			}
+			if palette == nil {
+				palette = slices.Clone(m.Palette)
+			}
+			palette[i] = color.NRGBAModel.Convert(c)
+		}
+		if palette == nil {
+			return m
+		}
+		rounded := *m
+		rounded.Palette = palette
+		return &rounded
+	default:
+		return img
+	}
+}
+
+// unpremultiplyRGBA converts src to NRGBA the same way the PNG encoder writes translucent RGBA pixels
+func unpremultiplyRGBA(src *image.RGBA) *image.NRGBA {
+	b := src.Bounds()
+	w := b.Dx()
+	dst := image.NewNRGBA(b)
+	parallelFor(b.Dy(), func(y int) {
+		srcRow := rgbaRow(src, y, w)
+		dstRow := dst.Pix[y*dst.Stride : y*dst.Stride+4*w]
+		for x := 0; x < w; x++ {
+			s := srcRow[4*x : 4*x+4 : 4*x+4]
+			d := dstRow[4*x : 4*x+4 : 4*x+4]
+			switch s[3] {
+			case 0:
+				d[0], d[1], d[2], d[3] = 0, 0, 0, 0
+			case 0xff:
+				copy(d, s)
+			default:
+				// Same arithmetic as color.NRGBAModel on the 16-bit components
+				const m = 0x101 * 0xffff
+				a := uint32(s[3]) * 0x101
+				d[0] = uint8((uint32(s[0]) * m / a) >> 8) // #nosec G115 -- premultiplied components are <= alpha, so the result is 0..255
+				d[1] = uint8((uint32(s[1]) * m / a) >> 8) // #nosec G115 -- premultiplied components are <= alpha, so the result is 0..255
+				d[2] = uint8((uint32(s[2]) * m / a) >> 8) // #nosec G115 -- premultiplied components are <= alpha, so the result is 0..255
+				d[3] = s[3]
+			}
+		}
+	})
+	return dst
+}
+
 // CommandInvoker executes a sequence of commands on image data
 type CommandInvoker struct {
 	commands []Command
@@ -31,24 +168,24 @@ func (i *CommandInvoker) Execute(imageData []byte) ([]byte, error) {
 		return imageData, nil
 	}
 
-	currentData := imageData
+	current := &pipelineImage{data: imageData}
 
 	for idx, command := range i.commands {
 		commandStart := time.Now()
 
+		inputSize := current.sizeAttr("input")
 		slog.Info("executing command",
 			"index", idx,
 			"command_name", command.Name(),
-			"input_size_bytes", len(currentData))
+			inputSize)
 
 		// Execute the command
-		processedData, err := command.Execute(currentData)
-		if err != nil {
+		if err := current.apply(command); err != nil {
 			slog.Error("command execution failed",
 				"index", idx,
 				"command_name", command.Name(),
 				"error", err,
-				"input_size_bytes", len(currentData))
+				inputSize)
 			return nil, fmt.Errorf("command %s (index %d) failed: %w", command.Name(), idx, err)
 		}
 
@@ -57,10 +194,14 @@ func (i *CommandInvoker) Execute(imageData []byte) ([]byte, error) {
 			"index", idx,
 			"command_name", command.Name(),
 			"duration_ms", commandDuration.Milliseconds(),
-			"input_size_bytes", len(currentData),
-			"output_size_bytes", len(processedData))
+			inputSize,
+			current.sizeAttr("output"))
+	}
 
-		currentData = processedData
+	currentData, err := current.bytes()
+	if err != nil {
+		slog.Error("failed to encode pipeline output", "error", err)
+		return nil, err
 	}
 
 	totalDuration := time.Since(start)
@@ -85,7 +226,7 @@ func ExecuteCommands(imageData []byte, commandConfigs []CommandConfig) ([]byte,
 		return imageData, nil
 	}
 
-	currentData := imageData
+	current := &pipelineImage{data: imageData}
 
 	for i, config := range commandConfigs {
 		commandStart := time.Now()
@@ -105,19 +246,19 @@ func ExecuteCommands(imageData []byte, commandConfigs []CommandConfig) ([]byte,
 			return nil, fmt.Errorf("failed to create command at index %d (%s): %w", i, config.Name, err)
 		}
 
+		inputSize := current.sizeAttr("input")
 		slog.Info("executing command",
 			"index", i,
 			"command_name", config.Name,
-			"input_size_bytes", len(currentData))
+			inputSize)
 
 		// Execute the command
-		processedData, err := command.Execute(currentData)
-		if err != nil {
+		if err := current.apply(command); err != nil {
 			slog.Error("command execution failed",
 				"index", i,
 				"command_name", config.Name,
 				"error", err,
-				"input_size_bytes", len(currentData))
+				inputSize)
 			return nil, fmt.Errorf("command %s (index %d) failed: %w", config.Name, i, err)
 		}
 
@@ -126,10 +267,14 @@ func ExecuteCommands(imageData []byte, commandConfigs []CommandConfig) ([]byte,
 			"index", i,
 			"command_name", config.Name,
 			"duration_ms", commandDuration.Milliseconds(),
-			"input_size_bytes", len(currentData),
-			"output_size_bytes", len(processedData))
+			inputSize,
+			current.sizeAttr("output"))
+	}
 
-		currentData = processedData
+	currentData, err := current.bytes()
+	if err != nil {
+		slog.Error("failed to encode pipeline output", "error", err)
+		return nil, err
 	}
 
 	totalDuration := time.Since(start)
@@ -1,7 +1,11 @@
 package imageprocessing
 
 import (
+	"bytes"
 	"errors"
+	"image"
+	"image/color"
+	"image/png"
 	"testing"
 )
 
@@ -153,3 +157,96 @@ func TestCommandInvoker_ErrorInMiddle(t *testing.T) {
 		t.Error("Expected non-empty error message")
 	}
 }
+
+// encodeTestPNG encodes img for pipeline tests
+func encodeTestPNG(t *testing.T, img image.Image) []byte {
+	t.Helper()
+	var buf bytes.Buffer
+	if err := png.Encode(&buf, img); err != nil {
+		t.Fatalf("failed to encode test image: %v", err)
+	}
+	return buf.Bytes()
+}
+
+func TestExecuteCommands_MatchesSequentialExecute(t *testing.T) {
+	// Translucent pixels are rounded through NRGBA whenever a command's output is written as PNG,
+	// so the pipeline must give the same result as running the commands one by one.
+	translucent := image.NewNRGBA(image.Rect(0, 0, 97, 61))
+	for y := 0; y < 61; y++ {
+		for x := 0; x < 97; x++ {
+			translucent.SetNRGBA(x, y, color.NRGBA{uint8(x * 2), uint8(y * 4), uint8((x + y) * 3), uint8((x * y) % 256)}) //nolint:gosec // test pattern wraps intentionally
+		}
+	}
+	paletted := image.NewPaletted(image.Rect(0, 0, 40, 30), color.Palette{
+		color.RGBA{0, 0, 0, 255},
+		color.NRGBA{10, 200, 10, 100},
+		color.RGBA{60, 20, 0, 80},
+	})
+	for i := range paletted.Pix {
+		paletted.Pix[i] = uint8(i % 3) //nolint:gosec // index < len(palette)
+	}
+	inputs := map[string][]byte{
+		"opaque":      createTestImage(64, 48),
+		"translucent": encodeTestPNG(t, translucent),
+		"paletted":    encodeTestPNG(t, paletted),
+	}
+
+	pipelines := map[string][]CommandConfig{
+		"mixed": {
+			{Name: "OrientationCommand", Params: map[string]any{"orientation": "portrait"}},
+			{Name: "ScaleCommand", Params: map[string]any{"height": 40, "width": 30}},
+			{Name: "DitherCommand", Params: map[string]any{}},
+			{Name: "CropCommand", Params: map[string]any{"height": 32, "width": 24}},
+			{Name: "RotationCommand", Params: map[string]any{"steps": 2}},
+		},
+		"scale-dither": {
+			{Name: "ScaleCommand", Params: map[string]any{"height": 300, "width": 500}},
+			{Name: "DitherCommand", Params: map[string]any{}},
+		},
+		"crop-rotate-bilinear": {
+			{Name: "CropCommand", Params: map[string]any{"height": 20, "width": 30}},
+			{Name: "RotationCommand", Params: map[string]any{"steps": 1}},
+			{Name: "ScaleCommand", Params: map[string]any{"height": 50, "width": 50, "resampling": "bilinear"}},
+			{Name: "DitherCommand", Params: map[string]any{}},
+		},
+	}
+
+	for inputName, imageData := range inputs {
+		for pipelineName, configs := range pipelines {
+			want := imageData
+			for _, config := range configs {
+				command, err := DefaultRegistry.Create(config.Name, config.Params)
+				if err != nil {
+					t.Fatalf("failed to create %s: %v", config.Name, err)
+				}
+				if want, err = command.Execute(want); err != nil {
+					t.Fatalf("%s failed: %v", config.Name, err)
+				}
+			}
+
+			got, err := ExecuteCommands(imageData, configs)
+			if err != nil {
+				t.Fatalf("ExecuteCommands failed: %v", err)
+			}
+			if !bytes.Equal(got, want) {
+				t.Errorf("%s/%s: pipeline output differs from executing commands one by one", inputName, pipelineName)
+			}
+		}
+	}
+}
+
+func TestExecuteCommands_UnchangedImageReturnsOriginalBytes(t *testing.T) {
+	imageData := createTestImage(64, 48)
+	configs := []CommandConfig{
+		{Name: "OrientationCommand", Params: map[string]any{"orientation": "landscape"}},
+		{Name: "CropCommand", Params: map[string]any{"height": 100, "width": 100}},
+	}
+
+	got, err := ExecuteCommands(imageData, configs)
+	if err != nil {
+		t.Fatalf("ExecuteCommands failed: %v", err)
+	}
+	if !bytes.Equal(got, imageData) {
+		t.Error("expected original bytes when no command changes the image")
+	}
+}
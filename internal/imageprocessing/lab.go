@@ -0,0 +1,53 @@
+package imageprocessing
+
+import (
+	"math"
+)
+
+// D65 reference white in CIE XYZ
+const (
+	labWhiteX = 0.95047
+	labWhiteY = 1.0
+	labWhiteZ = 1.08883
+)
+
+// srgbToLinear maps an 8-bit sRGB component to linear light.
+// Precomputed once so per-pixel conversions avoid math.Pow.
+var srgbToLinear = func() [256]float64 {
+	var lut [256]float64
+	for i := range lut {
+		c := float64(i) / 255
+		if c <= 0.04045 {
+			lut[i] = c / 12.92
+		} else {
+			lut[i] = math.Pow((c+0.055)/1.055, 2.4)
+		}
+	}
+	return lut
+}()
+
+// labF is the CIE Lab companding function
+func labF(t float64) float64 {
+	const delta = 6.0 / 29.0
+	if t > delta*delta*delta {
+		return math.Cbrt(t)
+	}
+	return t/(3*delta*delta) + 4.0/29.0
+}
+
+// srgbToLab converts 8-bit sRGB components (0..255) to CIE Lab (D65)
+func srgbToLab(r, g, b int) (float64, float64, float64) {
+	rl := srgbToLinear[r]
+	gl := srgbToLinear[g]
+	bl := srgbToLinear[b]
+
+	x := 0.4124564*rl + 0.3575761*gl + 0.1804375*bl
+	y := 0.2126729*rl + 0.7151522*gl + 0.0721750*bl
+	z := 0.0193339*rl + 0.1191920*gl + 0.9503041*bl
+
+	fx := labF(x / labWhiteX)
+	fy := labF(y / labWhiteY)
+	fz := labF(z / labWhiteZ)
+
+	return 116*fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+}
@@ -0,0 +1,28 @@
+package imageprocessing
+
+import (
+	"math"
+	"testing"
+)
+
+func TestSrgbToLab_ReferenceColors(t *testing.T) {
+	testCases := []struct {
+		name     string
+		r, g, b  int
+		l, a, bb float64
+	}{
+		{"black", 0, 0, 0, 0, 0, 0},
+		{"white", 255, 255, 255, 100, 0, 0},
+		{"red", 255, 0, 0, 53.24, 80.09, 67.20},
+		{"blue", 0, 0, 255, 32.30, 79.19, -107.86},
+	}
+
+	for _, tc := range testCases {
+		t.Run(tc.name, func(t *testing.T) {
+			l, a, bb := srgbToLab(tc.r, tc.g, tc.b)
+			if math.Abs(l-tc.l) > 0.05 || math.Abs(a-tc.a) > 0.05 || math.Abs(bb-tc.bb) > 0.05 {
+				t.Errorf("Expected Lab (%.2f, %.2f, %.2f), got (%.2f, %.2f, %.2f)", tc.l, tc.a, tc.bb, l, a, bb)
+			}
+		})
+	}
+}
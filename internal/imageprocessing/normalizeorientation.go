@@ -183,13 +183,40 @@ func flipVertical(img image.Image) image.Image {
 	return dst
 }
 
-// toRGBA converts any image.Image to *image.RGBA for uniform pixel access.
+// toRGBA converts img into an *image.RGBA covering the same bounds.
+// Components are premultiplied 8-bit values, identical to img.At(x, y).RGBA() >> 8,
+// so hot loops can index the pixel buffer directly instead of calling At per pixel.
+// An *image.RGBA input is returned as-is without copying; callers must treat the result as read-only.
 func toRGBA(img image.Image) *image.RGBA {
-	if r, ok := img.(*image.RGBA); ok {
-		return r
+	if rgba, ok := img.(*image.RGBA); ok {
+		return rgba
 	}
-	b := img.Bounds()
-	dst := image.NewRGBA(b)
-	draw.Draw(dst, b, img, b.Min, draw.Src)
+	bounds := img.Bounds()
+	dst := image.NewRGBA(bounds)
+	if p, ok := img.(*image.Paletted); ok {
+		expandPalettedInto(dst, p)
+		return dst
+	}
+	// Rows convert independently, so spread them across workers
+	parallelFor(bounds.Dy(), func(y int) {
+		rowRect := image.Rect(bounds.Min.X, bounds.Min.Y+y, bounds.Max.X, bounds.Min.Y+y+1)
+		draw.Draw(dst, rowRect, img, rowRect.Min, draw.Src)
+	})
 	return dst
 }
+
+// expandPalettedInto writes the colors of a paletted image into dst, which must share its bounds.
+// Each palette entry is converted once and then gathered by index; draw.Draw has no fast path
+// for paletted sources and would fall back to At per pixel.
+func expandPalettedInto(dst *image.RGBA, src *image.Paletted) {
+	lut := paletteRGBALookup(src.Palette)
+
+	w := src.Rect.Dx()
+	parallelFor(src.Rect.Dy(), func(y int) {
+		idxRow := src.Pix[y*src.Stride : y*src.Stride+w]
+		row := rgbaRow(dst, y, w)
+		for x, idx := range idxRow {
+			copy(row[4*x:4*x+4], lut[idx][:])
+		}
+	})
+}
@@ -79,31 +79,31 @@ func (c *OrientationCommand) Execute(imageData []byte) ([]byte, error) {
 		"rotate_when_square", c.params.RotateWhenSquare,
 		"clockwise", c.params.Clockwise)
 
-	img, err := decodePNG(imageData)
-	if err != nil {
-		slog.Error("OrientationCommand: failed to decode PNG image", "error", err)
-		return nil, err
-	}
+	return executeViaImage(c, imageData)
+}
 
+// ExecuteImage rotates a decoded image into the target orientation, returning img itself
+// when no rotation is needed
+func (c *OrientationCommand) ExecuteImage(img image.Image) (image.Image, error) {
 	b := img.Bounds()
 	width, height := b.Dx(), b.Dy()
 
 	if width == height {
-		return c.executeSquare(imageData, img)
+		return c.executeSquare(img), nil
 	}
-	return c.executeNonSquare(imageData, img, width, height)
+	return c.executeNonSquare(img, width, height), nil
 }
 
-func (c *OrientationCommand) executeSquare(original []byte, img image.Image) ([]byte, error) {
+func (c *OrientationCommand) executeSquare(img image.Image) image.Image {
 	if !c.params.RotateWhenSquare {
 		slog.Info("OrientationCommand: image is square and rotateWhenSquare=false; no rotation performed")
-		return original, nil
+		return img
 	}
 	slog.Info("OrientationCommand: image is square; rotating 90 degrees", "clockwise", c.params.Clockwise)
-	return c.encodeRotated(img)
+	return applyRotationSteps(img, Steps90, c.params.Clockwise)
 }
 
-func (c *OrientationCommand) executeNonSquare(original []byte, img image.Image, width, height int) ([]byte, error) {
+func (c *OrientationCommand) executeNonSquare(img image.Image, width, height int) image.Image {
 	isCurrentlyPortrait := height > width
 	needsPortrait := c.params.Orientation == "portrait"
 
@@ -115,23 +115,11 @@ func (c *OrientationCommand) executeNonSquare(original []byte, img image.Image,
 
 	if isCurrentlyPortrait == needsPortrait {
 		slog.Info("OrientationCommand: already in correct orientation, no rotation needed")
-		return original, nil
+		return img
 	}
 
 	slog.Info("OrientationCommand: rotating image 90 degrees", "clockwise", c.params.Clockwise)
-	return c.encodeRotated(img)
-}
-
-// encodeRotated applies one 90-degree rotation and encodes the result.
-func (c *OrientationCommand) encodeRotated(img image.Image) ([]byte, error) {
-	rotated := applyRotationSteps(img, Steps90, c.params.Clockwise)
-	result, err := encodePNG(rotated)
-	if err != nil {
-		slog.Error("OrientationCommand: failed to encode rotated image", "error", err)
-		return nil, err
-	}
-	slog.Debug("OrientationCommand: rotation complete", "output_size_bytes", len(result))
-	return result, nil
+	return applyRotationSteps(img, Steps90, c.params.Clockwise)
 }
 
 // GetOrientation returns the configured orientation.
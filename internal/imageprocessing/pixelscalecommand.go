@@ -1,10 +1,8 @@
 package imageprocessing
 
 import (
-	"bytes"
 	"fmt"
 	"image"
-	"image/png"
 	"log/slog"
 
 
@@ -102,13 +100,11 @@ func (c *PixelScaleCommand) Execute(imageData []byte) ([]byte, error) {
 	slog.Debug("PixelScaleCommand: decoding image",
 		"input_size_bytes", len(imageData))
 
-	// Decode the PNG image
-	img, err := png.Decode(bytes.NewReader(imageData))
-	if err != nil {
-		slog.Error("PixelScaleCommand: failed to decode PNG image", "error", err)
-		return nil, fmt.Errorf("failed to decode PNG image: %w", err)
-	}
+	return executeViaImage(c, imageData)
+}
 
+// ExecuteImage scales a decoded image, returning img itself when it already has the target size
+func (c *PixelScaleCommand) ExecuteImage(img image.Image) (image.Image, error) {
 	// Get original dimensions
 	bounds := img.Bounds()
 	originalWidth := bounds.Dx()
@@ -146,7 +142,7 @@ func (c *PixelScaleCommand) Execute(imageData []byte) ([]byte, error) {
 	// If target matches original dimensions, skip processing
 	if targetWidth == originalWidth && targetHeight == originalHeight {
 		slog.Debug("PixelScaleCommand: target dimensions equal original; skipping scaling")
-		return imageData, nil
+		return img, nil
 	}
 
 	slog.Debug("PixelScaleCommand: scaling image",
@@ -161,23 +157,7 @@ func (c *PixelScaleCommand) Execute(imageData []byte) ([]byte, error) {
 	// Use optimized scaler from golang.org/x/image/draw (NearestNeighbor)
 	xdraw.NearestNeighbor.Scale(targetImg, targetImg.Bounds(), img, bounds, xdraw.Src, nil)
 
-	slog.Debug("PixelScaleCommand: encoding scaled image")
-
-	// Encode the scaled image to PNG bytes
-	var buf bytes.Buffer
-	bb := targetImg.Bounds()
-	// Pre-grow buffer to reduce reallocations; rough heuristic ~1 byte per pixel
-	buf.Grow(bb.Dx() * bb.Dy())
-	err = png.Encode(&buf, targetImg)
-	if err != nil {
-		slog.Error("PixelScaleCommand: failed to encode scaled image", "error", err)
-		return nil, fmt.Errorf("failed to encode scaled PNG image: %w", err)
-	}
-
-	slog.Debug("PixelScaleCommand: scaling complete",
-		"output_size_bytes", buf.Len())
-
-	return buf.Bytes(), nil
+	return targetImg, nil
 }
 
 // GetHeight returns the configured height (may be nil if not specified)
@@ -9,25 +9,82 @@ import (
 func rotate90(img image.Image, clockwise bool) image.Image {
 	b := img.Bounds()
 	w, h := b.Dx(), b.Dy()
+	if p, ok := img.(*image.Paletted); ok {
+		dst := image.NewPaletted(image.Rect(0, 0, h, w), p.Palette)
+		rotate90Pix(dst.Pix, dst.Stride, p.Pix, p.Stride, w, h, 1, clockwise)
+		return dst
+	}
+	src := toRGBA(img)
 	dst := image.NewRGBA(image.Rect(0, 0, h, w))
-	for y := 0; y < h; y++ {
+	rotate90Pix(dst.Pix, dst.Stride, src.Pix, src.Stride, w, h, 4, clockwise)
+	return dst
+}
+
+// rotate180 rotates an image by 180 degrees in a single pass.
+func rotate180(img image.Image) image.Image {
+	b := img.Bounds()
+	w, h := b.Dx(), b.Dy()
+	if p, ok := img.(*image.Paletted); ok {
+		dst := image.NewPaletted(image.Rect(0, 0, w, h), p.Palette)
+		rotate180Pix(dst.Pix, dst.Stride, p.Pix, p.Stride, w, h, 1)
+		return dst
+	}
+	src := toRGBA(img)
+	dst := image.NewRGBA(image.Rect(0, 0, w, h))
+	rotate180Pix(dst.Pix, dst.Stride, src.Pix, src.Stride, w, h, 4)
+	return dst
+}
+
+// rotate90Pix rotates a w×h buffer of bpp-byte pixels by 90 degrees into dst (h×w)
+func rotate90Pix(dst []uint8, dstStride int, src []uint8, srcStride, w, h, bpp int, clockwise bool) {
+	parallelFor(h, func(y int) {
+		row := src[y*srcStride : y*srcStride+bpp*w]
 		for x := 0; x < w; x++ {
+			var dx, dy int
 			if clockwise {
 				// (x,y) -> (h-1-y, x)
-				dst.Set(h-1-y, x, img.At(x, y))
+				dx, dy = h-1-y, x
 			} else {
 				// (x,y) -> (y, w-1-x)
-				dst.Set(y, w-1-x, img.At(x, y))
+				dx, dy = y, w-1-x
 			}
+			off := dy*dstStride + dx*bpp
+			copy(dst[off:off+bpp], row[bpp*x:bpp*x+bpp])
 		}
-	}
-	return dst
+	})
+}
+
+// rotate180Pix rotates a w×h buffer of bpp-byte pixels by 180 degrees into dst:
+// source row y becomes destination row h-1-y with its pixels in reverse order.
+func rotate180Pix(dst []uint8, dstStride int, src []uint8, srcStride, w, h, bpp int) {
+	parallelFor(h, func(y int) {
+		row := src[y*srcStride : y*srcStride+bpp*w]
+		dstRow := dst[(h-1-y)*dstStride : (h-1-y)*dstStride+bpp*w]
+		for x := 0; x < w; x++ {
+			dx := bpp * (w - 1 - x)
+			copy(dstRow[dx:dx+bpp], row[bpp*x:bpp*x+bpp])
+		}
+	})
 }
 
 // applyRotationSteps applies steps × 90-degree rotations to img.
+// The steps are reduced to a net number of clockwise quarter turns first, so 180° is one pass
+// and 270° is a single 90° rotation in the opposite direction.
+// Paletted images stay paletted so they keep encoding as compact indexed PNGs.
 func applyRotationSteps(img image.Image, steps int, clockwise bool) image.Image {
-	for range steps {
-		img = rotate90(img, clockwise)
+	quarterTurns := ((steps % 4) + 4) % 4
+	if !clockwise {
+		quarterTurns = (4 - quarterTurns) % 4
+	}
+
+	switch quarterTurns {
+	case 1:
+		return rotate90(img, true)
+	case 2:
+		return rotate180(img)
+	case 3:
+		return rotate90(img, false)
+	default:
+		return img
 	}
-	return img
 }
@@ -2,6 +2,7 @@ package imageprocessing
 
 import (
 	"fmt"
+	"image"
 	"log/slog"
 
 )
@@ -77,22 +78,12 @@ func (c *RotationCommand) Execute(imageData []byte) ([]byte, error) {
 		"steps", c.params.Steps,
 		"clockwise", c.params.Clockwise)
 
-	img, err := decodePNG(imageData)
-	if err != nil {
-		slog.Error("RotationCommand: failed to decode PNG image", "error", err)
-		return nil, err
-	}
-
-	rotated := applyRotationSteps(img, c.params.Steps, c.params.Clockwise)
-
-	result, err := encodePNG(rotated)
-	if err != nil {
-		slog.Error("RotationCommand: failed to encode image", "error", err)
-		return nil, err
-	}
+	return executeViaImage(c, imageData)
+}
 
-	slog.Debug("RotationCommand: rotation complete", "output_size_bytes", len(result))
-	return result, nil
+// ExecuteImage rotates a decoded image by the configured number of steps
+func (c *RotationCommand) ExecuteImage(img image.Image) (image.Image, error) {
+	return applyRotationSteps(img, c.params.Steps, c.params.Clockwise), nil
 }
 
 // GetParams returns the typed parameters.
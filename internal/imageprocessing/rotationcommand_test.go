@@ -271,3 +271,47 @@ func makeRectPNG(t *testing.T, width, height int) []byte {
 	}
 	return buf.Bytes()
 }
+
+// A single-pass 180° rotation must match two successive 90° rotations
+func TestApplyRotationSteps_180MatchesTwo90(t *testing.T) {
+	src := image.NewNRGBA(image.Rect(0, 0, 7, 4))
+	for y := 0; y < 4; y++ {
+		for x := 0; x < 7; x++ {
+			src.SetNRGBA(x, y, color.NRGBA{R: uint8(x * 30), G: uint8(y * 60), B: 10, A: uint8(100 + x)}) //nolint:gosec // small test values
+		}
+	}
+
+	want := rotate90(rotate90(src, true), true).(*image.RGBA)
+	for _, clockwise := range []bool{true, false} {
+		got := applyRotationSteps(src, Steps180, clockwise).(*image.RGBA)
+		if got.Bounds() != want.Bounds() || !bytes.Equal(got.Pix, want.Pix) {
+			t.Errorf("clockwise=%v: 180° rotation differs from two 90° rotations", clockwise)
+		}
+	}
+
+	// 270° one way equals 90° the other way
+	got := applyRotationSteps(src, Steps270, true).(*image.RGBA)
+	want = rotate90(src, false).(*image.RGBA)
+	if !bytes.Equal(got.Pix, want.Pix) {
+		t.Error("270° clockwise rotation differs from 90° counterclockwise rotation")
+	}
+}
+
+func TestApplyRotationSteps_PalettedStaysPaletted(t *testing.T) {
+	palette := color.Palette{color.RGBA{0, 0, 0, 255}, color.RGBA{255, 255, 255, 255}, color.RGBA{255, 0, 0, 255}}
+	src := image.NewPaletted(image.Rect(0, 0, 5, 3), palette)
+	for i := range src.Pix {
+		src.Pix[i] = uint8(i % len(palette)) //nolint:gosec // small test values
+	}
+
+	for _, steps := range []int{Steps90, Steps180, Steps270} {
+		got, ok := applyRotationSteps(src, steps, true).(*image.Paletted)
+		if !ok {
+			t.Fatalf("steps=%d: expected *image.Paletted result", steps)
+		}
+		want := applyRotationSteps(toRGBA(src), steps, true).(*image.RGBA)
+		if !bytes.Equal(toRGBA(got).Pix, want.Pix) {
+			t.Errorf("steps=%d: paletted rotation differs from RGBA rotation", steps)
+		}
+	}
+}
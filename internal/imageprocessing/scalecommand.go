@@ -11,6 +11,13 @@ import (
 
 )
 
+const (
+	// ResamplingNearest picks the nearest source pixel (default)
+	ResamplingNearest = "nearest"
+	// ResamplingBilinear interpolates between the four nearest source pixels
+	ResamplingBilinear = "bilinear"
+)
+
 // ScaleParams represents typed parameters for scale command
 const DefaultEdgeGradientBWThreshold = 0.75 // default fraction of full luminance [0..1]
 type ScaleParams struct {
@@ -18,6 +25,8 @@ type ScaleParams struct {
 	Width                   int
 	EdgeGradient            bool
 	EdgeGradientBWThreshold float64
+	// Resampling selects the resampling filter: "nearest" (default) or "bilinear"
+	Resampling string
 }
 
 // NewScaleParamsFromMap creates ScaleParams from a generic map
@@ -37,6 +46,22 @@ func NewScaleParamsFromMap(params map[string]any) (*ScaleParams, error) {
 		edgeGradientBWThreshold = 1
 	}
 
+	resampling := ResamplingNearest
+	if resamplingParam, ok := params["resampling"]; ok {
+		s, ok := resamplingParam.(string)
+		if !ok {
+			return nil, fmt.Errorf("resampling must be a string")
+		}
+		switch s {
+		case "", ResamplingNearest:
+			resampling = ResamplingNearest
+		case ResamplingBilinear:
+			resampling = ResamplingBilinear
+		default:
+			return nil, fmt.Errorf("invalid resampling: %s", s)
+		}
+	}
+
 	// Validate dimensions are positive
 	if height <= 0 {
 		return nil, fmt.Errorf("height must be positive, got %d", height)
@@ -50,6 +75,7 @@ func NewScaleParamsFromMap(params map[string]any) (*ScaleParams, error) {
 		Width:                   width,
 		EdgeGradient:            edgeGradient,
 		EdgeGradientBWThreshold: edgeGradientBWThreshold,
+		Resampling:              resampling,
 	}, nil
 }
 
@@ -88,6 +114,7 @@ func NewScaleCommandWithParams(height, width int) (*ScaleCommand, error) {
 			Width:                   width,
 			EdgeGradient:            false,
 			EdgeGradientBWThreshold: DefaultEdgeGradientBWThreshold,
+			Resampling:              ResamplingNearest,
 		},
 	}, nil
 }
@@ -102,13 +129,11 @@ func (c *ScaleCommand) Execute(imageData []byte) ([]byte, error) {
 	slog.Debug("ScaleCommand: decoding image",
 		"input_size_bytes", len(imageData))
 
-	// Decode the PNG image
-	img, err := decodePNG(imageData)
-	if err != nil {
-		slog.Error("ScaleCommand: failed to decode PNG image", "error", err)
-		return nil, fmt.Errorf("failed to decode PNG image: %w", err)
-	}
+	return executeViaImage(c, imageData)
+}
 
+// ExecuteImage scales a decoded image, returning img itself when it already has the target size
+func (c *ScaleCommand) ExecuteImage(img image.Image) (image.Image, error) {
 	// Get original dimensions
 	bounds := img.Bounds()
 	originalWidth := bounds.Dx()
@@ -120,7 +145,7 @@ func (c *ScaleCommand) Execute(imageData []byte) ([]byte, error) {
 	// If target matches original dimensions, skip processing
 	if targetWidth == originalWidth && targetHeight == originalHeight {
 		slog.Debug("ScaleCommand: target dimensions equal original; skipping scaling")
-		return imageData, nil
+		return img, nil
 	}
 
 	// Calculate aspect ratios for debugging
@@ -140,16 +165,27 @@ func (c *ScaleCommand) Execute(imageData []byte) ([]byte, error) {
 		"scaled_width", scaledWidth,
 		"scaled_height", scaledHeight)
 
-	// Create target canvas and center placement
-	targetImg := createTargetCanvas(targetWidth, targetHeight, color.RGBA{255, 255, 255, 255})
+	// Create target canvas and center placement; only the padding around the image is filled,
+	// the scaled image overwrites everything else
 	offsetX, offsetY := computeCenterOffset(targetWidth, targetHeight, scaledWidth, scaledHeight)
+	content := image.Rect(offsetX, offsetY, offsetX+scaledWidth, offsetY+scaledHeight)
+	targetImg := createLetterboxCanvas(targetWidth, targetHeight, content, color.RGBA{255, 255, 255, 255})
 	slog.Debug("ScaleCommand: centering image on canvas",
 		"offset_x", offsetX,
 		"offset_y", offsetY)
 
-	// Build index maps and draw scaled image
-	xMap, yMap := buildIndexMaps(originalWidth, originalHeight, scaledWidth, scaledHeight)
-	drawScaledNearest(targetImg, img, offsetX, offsetY, scaledWidth, scaledHeight, xMap, yMap)
+	if c.params.Resampling == ResamplingBilinear {
+		src := toRGBA(img)
+		// Box-reduce first so every source pixel contributes; bilinear then covers the remaining fractional ratio
+		if factor := reduceFactor(originalWidth, originalHeight, scaledWidth, scaledHeight); factor > 1 {
+			src = reduceBox(src, factor)
+		}
+		drawScaledBilinear(targetImg, src, offsetX, offsetY, scaledWidth, scaledHeight)
+	} else {
+		// Build index maps and draw scaled image
+		xMap, yMap := buildIndexMaps(originalWidth, originalHeight, scaledWidth, scaledHeight)
+		drawScaledNearest(targetImg, img, offsetX, offsetY, scaledWidth, scaledHeight, xMap, yMap)
+	}
 
 	// Optional: Fill padding areas with gradient from image edge colors to black/white border.
 	// Use scaled vs target size to detect any padding (including 1px on one side when centering odd differences).
@@ -157,19 +193,7 @@ func (c *ScaleCommand) Execute(imageData []byte) ([]byte, error) {
 		fillEdgeGradientPadding(targetImg, offsetX, offsetY, scaledWidth, scaledHeight, c.params.EdgeGradientBWThreshold)
 	}
 
-	slog.Debug("ScaleCommand: encoding scaled image")
-
-	// Encode the scaled image to PNG bytes
-	out, err := encodePNG(targetImg)
-	if err != nil {
-		slog.Error("ScaleCommand: failed to encode scaled image", "error", err)
-		return nil, fmt.Errorf("failed to encode scaled PNG image: %w", err)
-	}
-
-	slog.Debug("ScaleCommand: scaling complete",
-		"output_size_bytes", len(out))
-
-	return out, nil
+	return targetImg, nil
 }
 
 // GetHeight returns the configured height
@@ -213,6 +237,31 @@ func createTargetCanvas(w, h int, bg color.Color) *image.RGBA {
 	return dst
 }
 
+// createLetterboxCanvas creates a w×h canvas and fills only the area outside content with bg.
+// When content covers the whole canvas no fill is performed at all.
+func createLetterboxCanvas(w, h int, content image.Rectangle, bg color.Color) *image.RGBA {
+	dst := image.NewRGBA(image.Rect(0, 0, w, h))
+	content = content.Intersect(dst.Bounds())
+	if content.Empty() {
+		draw.Draw(dst, dst.Bounds(), &image.Uniform{bg}, image.Point{}, draw.Src)
+		return dst
+	}
+
+	src := &image.Uniform{bg}
+	bands := []image.Rectangle{
+		image.Rect(0, 0, w, content.Min.Y),                         // top
+		image.Rect(0, content.Max.Y, w, h),                         // bottom
+		image.Rect(0, content.Min.Y, content.Min.X, content.Max.Y), // left
+		image.Rect(content.Max.X, content.Min.Y, w, content.Max.Y), // right
+	}
+	for _, band := range bands {
+		if !band.Empty() {
+			draw.Draw(dst, band, src, image.Point{}, draw.Src)
+		}
+	}
+	return dst
+}
+
 func computeCenterOffset(targetWidth, targetHeight, scaledWidth, scaledHeight int) (int, int) {
 	return (targetWidth - scaledWidth) / 2, (targetHeight - scaledHeight) / 2
 }
@@ -235,12 +284,134 @@ func buildIndexMaps(originalWidth, originalHeight, scaledWidth, scaledHeight int
 	return xMap, yMap
 }
 
+// drawScaledNearest copies nearest-neighbor samples of src into dst at the given offset.
+// RGBA and paletted sources are sampled straight from their pixel buffers (paletted ones through a
+// per-index color table); other sources convert only the sampled pixels rather than the whole image.
 func drawScaledNearest(dst *image.RGBA, src image.Image, offsetX, offsetY, scaledWidth, scaledHeight int, xMap, yMap []int) {
-	parallelFor(scaledHeight, func(y int) {
-		for x := 0; x < scaledWidth; x++ {
-			srcX := xMap[x]
+	switch s := src.(type) {
+	case *image.RGBA:
+		parallelFor(scaledHeight, func(y int) {
+			srcRow := s.Pix[yMap[y]*s.Stride:]
+			row := dst.Pix[dst.PixOffset(offsetX, offsetY+y):]
+			for x, srcX := range xMap[:scaledWidth] {
+				copy(row[4*x:4*x+4], srcRow[4*srcX:4*srcX+4])
+			}
+		})
+	case *image.Paletted:
+		lut := paletteRGBALookup(s.Palette)
+		parallelFor(scaledHeight, func(y int) {
+			idxRow := s.Pix[yMap[y]*s.Stride:]
+			row := dst.Pix[dst.PixOffset(offsetX, offsetY+y):]
+			for x, srcX := range xMap[:scaledWidth] {
+				copy(row[4*x:4*x+4], lut[idxRow[srcX]][:])
+			}
+		})
+	default:
+		parallelFor(scaledHeight, func(y int) {
 			srcY := yMap[y]
-			dst.Set(offsetX+x, offsetY+y, src.At(srcX, srcY))
+			row := dst.Pix[dst.PixOffset(offsetX, offsetY+y):]
+			for x, srcX := range xMap[:scaledWidth] {
+				c := color.RGBAModel.Convert(src.At(srcX, srcY)).(color.RGBA)
+				row[4*x], row[4*x+1], row[4*x+2], row[4*x+3] = c.R, c.G, c.B, c.A
+			}
+		})
+	}
+}
+
+// reduceFactor returns the integer box-reduction factor to apply before bilinear resampling.
+// It leaves less than 2x of downscaling for the resampler, which is as much as its 2×2 taps can cover
+// without skipping source pixels. Returns 1 for no reduction.
+func reduceFactor(originalWidth, originalHeight, scaledWidth, scaledHeight int) int {
+	if scaledWidth <= 0 || scaledHeight <= 0 {
+		return 1
+	}
+	fx := originalWidth / scaledWidth
+	fy := originalHeight / scaledHeight
+	return max(min(fx, fy), 1)
+}
+
+// reduceBox shrinks src by an integer factor, averaging each factor×factor block.
+// Blocks on the right and bottom edges average only the pixels that exist.
+func reduceBox(src *image.RGBA, factor int) *image.RGBA {
+	sb := src.Bounds()
+	sw, sh := sb.Dx(), sb.Dy()
+	dw := (sw + factor - 1) / factor
+	dh := (sh + factor - 1) / factor
+	dst := image.NewRGBA(image.Rect(0, 0, dw, dh))
+
+	parallelFor(dh, func(y int) {
+		y0 := y * factor
+		y1 := min(y0+factor, sh)
+		dstRow := rgbaRow(dst, y, dw)
+		for x := 0; x < dw; x++ {
+			x0 := x * factor
+			x1 := min(x0+factor, sw)
+			var sum [4]int
+			for sy := y0; sy < y1; sy++ {
+				block := rgbaRow(src, sy, x1)[4*x0:]
+				for i := 0; i < len(block); i += 4 {
+					sum[0] += int(block[i])
+					sum[1] += int(block[i+1])
+					sum[2] += int(block[i+2])
+					sum[3] += int(block[i+3])
+				}
+			}
+			n := (y1 - y0) * (x1 - x0)
+			for c := 0; c < 4; c++ {
+				dstRow[4*x+c] = uint8((sum[c] + n/2) / n) // #nosec G115 -- average of 8-bit values stays within 0..255
+			}
+		}
+	})
+	return dst
+}
+
+// bilinearTaps holds, for one output coordinate, the two neighboring source indices and the weight of the second
+type bilinearTaps struct {
+	i0, i1 int
+	t      float64
+}
+
+// buildBilinearTaps maps each output coordinate onto the source axis using pixel-center alignment
+func buildBilinearTaps(srcLen, dstLen int) []bilinearTaps {
+	taps := make([]bilinearTaps, dstLen)
+	scale := float64(srcLen) / float64(dstLen)
+	for i := range taps {
+		pos := (float64(i)+0.5)*scale - 0.5
+		if pos < 0 {
+			pos = 0
+		}
+		i0 := int(pos)
+		if i0 >= srcLen-1 {
+			taps[i] = bilinearTaps{i0: srcLen - 1, i1: srcLen - 1}
+			continue
+		}
+		taps[i] = bilinearTaps{i0: i0, i1: i0 + 1, t: pos - float64(i0)}
+	}
+	return taps
+}
+
+// drawScaledBilinear resamples src into the scaledWidth×scaledHeight area of dst at the given offset.
+// Interpolation runs on premultiplied components, so transparent pixels do not bleed color.
+func drawScaledBilinear(dst *image.RGBA, src *image.RGBA, offsetX, offsetY, scaledWidth, scaledHeight int) {
+	sb := src.Bounds()
+	xTaps := buildBilinearTaps(sb.Dx(), scaledWidth)
+	yTaps := buildBilinearTaps(sb.Dy(), scaledHeight)
+
+	parallelFor(scaledHeight, func(y int) {
+		ty := yTaps[y]
+		row0 := rgbaRow(src, ty.i0, sb.Dx())
+		row1 := rgbaRow(src, ty.i1, sb.Dx())
+		dstRow := dst.Pix[dst.PixOffset(offsetX, offsetY+y):]
+		for x, tx := range xTaps {
+			a := row0[4*tx.i0:]
+			b := row0[4*tx.i1:]
+			c := row1[4*tx.i0:]
+			d := row1[4*tx.i1:]
+			for ch := 0; ch < 4; ch++ {
+				top := float64(a[ch]) + (float64(b[ch])-float64(a[ch]))*tx.t
+				bottom := float64(c[ch]) + (float64(d[ch])-float64(c[ch]))*tx.t
+				dstRow[4*x+ch] = uint8(top + (bottom-top)*ty.t + 0.5) // #nosec G115 -- interpolated 8-bit values stay within 0..255
+			}
 		}
 	})
 }
@@ -339,15 +510,36 @@ func fillHorizontalBand(img *image.RGBA, yStart, yEnd int, edgeY, imgX0, imgX1 i
 
 func encodePNG(img image.Image) ([]byte, error) {
 	var buf bytes.Buffer
-	bb := img.Bounds()
-	// Pre-grow buffer to reduce re-allocations; rough heuristic: 1 byte per pixel
-	buf.Grow(bb.Dx() * bb.Dy())
+	// Pre-grow buffer to reduce re-allocations
+	buf.Grow(pngSizeHint(img))
 	if err := png.Encode(&buf, img); err != nil {
 		return nil, err
 	}
 	return buf.Bytes(), nil
 }
 
+// pngSizeHint estimates the encoded size of img for pre-growing PNG output buffers.
+// Paletted images are written with 1, 2, 4 or 8 bits per pixel depending on their palette size,
+// so they are estimated by their packed rows; other images use a rough 1 byte per pixel.
+func pngSizeHint(img image.Image) int {
+	bb := img.Bounds()
+	p, ok := img.(*image.Paletted)
+	if !ok {
+		return bb.Dx() * bb.Dy()
+	}
+	bitsPerPixel := 8
+	switch n := len(p.Palette); {
+	case n <= 2:
+		bitsPerPixel = 1
+	case n <= 4:
+		bitsPerPixel = 2
+	case n <= 16:
+		bitsPerPixel = 4
+	}
+	// Each row is prefixed by a filter-type byte
+	return ((bb.Dx()*bitsPerPixel+7)/8 + 1) * bb.Dy()
+}
+
 func clampInt(v, lo, hi int) int {
 	if v < lo {
 		return lo
@@ -2,6 +2,8 @@ package imageprocessing
 
 import (
 	"bytes"
+	"image"
+	"image/color"
 	"image/png"
 	"os"
 	"testing"
@@ -253,3 +255,187 @@ func TestScaleCommand_WithRealImage(t *testing.T) {
 		t.Errorf("Expected output dimensions 300x300, got %dx%d", bounds.Dx(), bounds.Dy())
 	}
 }
+
+func TestNewScaleCommand_InvalidResampling(t *testing.T) {
+	_, err := NewScaleCommand(map[string]any{
+		"height":     100,
+		"width":      100,
+		"resampling": "bicubic",
+	})
+	if err == nil {
+		t.Error("Expected error for invalid resampling")
+	}
+}
+
+func TestScaleCommand_BilinearWithRealImage(t *testing.T) {
+	imageData, err := os.ReadFile("testdata/peppers.png")
+	if err != nil {
+		t.Fatalf("Failed to load test image: %v", err)
+	}
+
+	command, err := NewScaleCommand(map[string]any{
+		"height":     120,
+		"width":      200,
+		"resampling": "bilinear",
+	})
+	if err != nil {
+		t.Fatalf("Failed to create command: %v", err)
+	}
+
+	result, err := command.Execute(imageData)
+	if err != nil {
+		t.Fatalf("Execute failed: %v", err)
+	}
+
+	img, err := png.Decode(bytes.NewReader(result))
+	if err != nil {
+		t.Fatalf("Result is not valid PNG: %v", err)
+	}
+	if bounds := img.Bounds(); bounds.Dx() != 200 || bounds.Dy() != 120 {
+		t.Errorf("Expected output dimensions 200x120, got %dx%d", bounds.Dx(), bounds.Dy())
+	}
+}
+
+// A uniform image must stay uniform through box reduction and bilinear interpolation
+func TestDrawScaledBilinear_UniformColor(t *testing.T) {
+	fill := color.RGBA{R: 10, G: 120, B: 230, A: 255}
+	src := image.NewRGBA(image.Rect(0, 0, 97, 53))
+	for y := 0; y < 53; y++ {
+		for x := 0; x < 97; x++ {
+			src.SetRGBA(x, y, fill)
+		}
+	}
+
+	reduced := reduceBox(src, reduceFactor(97, 53, 20, 10))
+	if reduced.Bounds().Dx() != 25 || reduced.Bounds().Dy() != 14 {
+		t.Fatalf("Expected reduced size 25x14, got %v", reduced.Bounds())
+	}
+
+	dst := image.NewRGBA(image.Rect(0, 0, 24, 14))
+	drawScaledBilinear(dst, reduced, 2, 2, 20, 10)
+	for y := 2; y < 12; y++ {
+		for x := 2; x < 22; x++ {
+			if got := dst.RGBAAt(x, y); got != fill {
+				t.Fatalf("Pixel (%d,%d): expected %v, got %v", x, y, fill, got)
+			}
+		}
+	}
+	if got := dst.RGBAAt(0, 0); got != (color.RGBA{}) {
+		t.Errorf("Expected pixels outside the scaled area to be untouched, got %v", got)
+	}
+}
+
+func TestScaleCommand_BilinearAveragesHighFrequencyPattern(t *testing.T) {
+	// Every third column is black, so any downscale should keep the mean near 2/3 of white
+	src := image.NewRGBA(image.Rect(0, 0, 300, 300))
+	for y := 0; y < 300; y++ {
+		for x := 0; x < 300; x++ {
+			v := uint8(255)
+			if x%3 == 0 {
+				v = 0
+			}
+			src.SetRGBA(x, y, color.RGBA{R: v, G: v, B: v, A: 255})
+		}
+	}
+	var buf bytes.Buffer
+	if err := png.Encode(&buf, src); err != nil {
+		t.Fatalf("Failed to encode test image: %v", err)
+	}
+
+	for _, size := range []int{100, 130, 71} {
+		command, err := NewScaleCommand(map[string]any{"height": size, "width": size, "resampling": "bilinear"})
+		if err != nil {
+			t.Fatalf("Failed to create command: %v", err)
+		}
+		result, err := command.Execute(buf.Bytes())
+		if err != nil {
+			t.Fatalf("Execute failed: %v", err)
+		}
+		img, err := png.Decode(bytes.NewReader(result))
+		if err != nil {
+			t.Fatalf("Result is not valid PNG: %v", err)
+		}
+
+		sum := 0
+		for y := 0; y < size; y++ {
+			for x := 0; x < size; x++ {
+				r, _, _, _ := img.At(x, y).RGBA()
+				sum += int(r >> 8)
+			}
+		}
+		if mean := sum / (size * size); mean < 150 || mean > 190 {
+			t.Errorf("%dx%d: expected mean near 170, got %d", size, size, mean)
+		}
+	}
+}
+
+func TestCreateLetterboxCanvas_FillsOnlyPadding(t *testing.T) {
+	white := color.RGBA{R: 255, G: 255, B: 255, A: 255}
+	content := image.Rect(3, 0, 7, 5)
+	canvas := createLetterboxCanvas(10, 5, content, white)
+
+	for y := 0; y < 5; y++ {
+		for x := 0; x < 10; x++ {
+			got := canvas.RGBAAt(x, y)
+			inContent := image.Pt(x, y).In(content)
+			if inContent && got != (color.RGBA{}) {
+				t.Fatalf("Expected content pixel (%d,%d) to be left unfilled, got %v", x, y, got)
+			}
+			if !inContent && got != white {
+				t.Fatalf("Expected padding pixel (%d,%d) to be white, got %v", x, y, got)
+			}
+		}
+	}
+}
+
+func TestDrawScaledNearest_MatchesAt(t *testing.T) {
+	nrgba := image.NewNRGBA(image.Rect(0, 0, 9, 7))
+	for i := range nrgba.Pix {
+		nrgba.Pix[i] = uint8(i * 37) //nolint:gosec // test pattern
+	}
+	paletted := image.NewPaletted(image.Rect(0, 0, 9, 7), color.Palette{color.RGBA{0, 0, 0, 255}, color.NRGBA{200, 10, 10, 128}})
+	for i := range paletted.Pix {
+		paletted.Pix[i] = uint8(i % 2) //nolint:gosec // test pattern
+	}
+
+	for name, src := range map[string]image.Image{"nrgba": nrgba, "paletted": paletted} {
+		xMap, yMap := buildIndexMaps(9, 7, 5, 4)
+		dst := image.NewRGBA(image.Rect(0, 0, 7, 6))
+		drawScaledNearest(dst, src, 1, 2, 5, 4, xMap, yMap)
+		for y := 0; y < 4; y++ {
+			for x := 0; x < 5; x++ {
+				want := color.RGBAModel.Convert(src.At(xMap[x], yMap[y]))
+				if got := dst.RGBAAt(1+x, 2+y); got != want {
+					t.Errorf("%s: pixel (%d,%d) = %v, want %v", name, x, y, got, want)
+				}
+			}
+		}
+	}
+}
+
+func TestPNGSizeHint(t *testing.T) {
+	palette := func(n int) color.Palette {
+		p := make(color.Palette, n)
+		for i := range p {
+			p[i] = color.Gray{Y: uint8(i)} //nolint:gosec // small test values
+		}
+		return p
+	}
+	rect := image.Rect(0, 0, 10, 3)
+	tests := []struct {
+		name string
+		img  image.Image
+		want int
+	}{
+		{"rgba", image.NewRGBA(rect), 30},
+		{"1 bit", image.NewPaletted(rect, palette(2)), (2 + 1) * 3},
+		{"2 bit", image.NewPaletted(rect, palette(4)), (3 + 1) * 3},
+		{"4 bit", image.NewPaletted(rect, palette(7)), (5 + 1) * 3},
+		{"8 bit", image.NewPaletted(rect, palette(17)), (10 + 1) * 3},
+	}
+	for _, tt := range tests {
+		if got := pngSizeHint(tt.img); got != tt.want {
+			t.Errorf("%s: pngSizeHint = %d, want %d", tt.name, got, tt.want)
+		}
+	}
+}